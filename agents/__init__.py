@@ -13,8 +13,11 @@ class SkillAgent(BaseAgent):
         super().__init__()
     
     def _build_registry(self):
-        for intent, handler in self._handlers.items():
-            self.registry[intent] = lambda handler=handler, **kw: handler(intent=intent, **kw)
+        for intent in self._handlers:
+            self.registry[intent] = self._dispatch
+
+    def _dispatch(self, intent: str, **kw):
+        return self._handlers[intent](intent=intent, **kw)
 
 
 class AgentRegistry:
@@ -24,6 +27,7 @@ class AgentRegistry:
         self.agents = {}
         self._register_agents()
         self._load_skills()
+        self._build_intent_map()
     
     def _register_agents(self):
         self.agents["orchestrator"] = OrchestratorAgent()
@@ -32,8 +36,8 @@ class AgentRegistry:
     def _load_skills(self):
         """Load skills and register them as lightweight agents."""
         try:
-            from core.skill_loader import SkillLoader
-            loader = SkillLoader()
+            from core.skill_loader import get_skill_loader
+            loader = get_skill_loader()
             
             if loader.get_loaded_count() == 0:
                 return
@@ -54,15 +58,21 @@ class AgentRegistry:
         except Exception as e:
             logging.error(f"AgentRegistry: Skills loading failed: {e}")
     
+    def _build_intent_map(self):
+        """Flatten 'agent:action' intents to their agent so routing is one dict lookup."""
+        self._intent_map = {
+            intent: agent
+            for name, agent in self.agents.items()
+            for intent in agent.get_available_intents()
+            if intent.partition(":")[0] == name and ":" in intent
+        }
+    
     def get_agent(self, agent_name: str):
         return self.agents.get(agent_name)
     
     def route_intent(self, intent: str):
-        if ":" not in intent:
-            return None, None
-        agent_name, _ = intent.split(":", 1)
-        agent = self.get_agent(agent_name)
-        if agent and agent.can_handle(intent):
+        agent = self._intent_map.get(intent)
+        if agent:
             return agent, intent
         return None, None
     
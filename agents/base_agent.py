@@ -1,10 +1,9 @@
 # agents/base_agent.py — Omega Claw
 # SECURITY §3.3: All agents enforce a formal capability matrix.
-from abc import ABC, abstractmethod
 from typing import Dict, Callable, List
 import logging
 
-class BaseAgent(ABC):
+class BaseAgent:
     """Base class for all Omega Claw agents. Enforces SECURITY.xml §3.3."""
     
     # SECURITY §3.3: Capability Matrix — subclasses MUST define these
@@ -14,14 +13,20 @@ class BaseAgent(ABC):
     FORBIDDEN_ACTIONS: List[str] = []
     MAX_BLAST_RADIUS: str = "Undefined"
     
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Checked once at class creation instead of via ABCMeta on every instantiation
+        if cls._build_registry is BaseAgent._build_registry:
+            raise TypeError(f"{cls.__name__} must define _build_registry")
+    
     def __init__(self):
         self.name = self.__class__.__name__
         self.registry: Dict[str, Callable] = {}
         self._build_registry()
         self._log_capability_matrix()
     
-    @abstractmethod
     def _build_registry(self):
+        """Populate self.registry with intent -> handler; every subclass overrides this."""
         pass
     
     def _log_capability_matrix(self):
@@ -40,7 +45,7 @@ class BaseAgent(ABC):
         if not self.can_handle(intent):
             return f"❌ {self.name} cannot handle: {intent}"
         try:
-            return self.registry[intent](**kwargs)
+            return self.registry[intent](intent, **kwargs)
         except Exception as e:
             # SECURITY §0.8: Never leak internals
             logging.error(f"{self.name} execution failed: {e}", exc_info=True)
@@ -1,13 +1,58 @@
 # agents/orchestrator_agent/__init__.py — Omega Claw
 from agents.base_agent import BaseAgent
-from db.database import create_job
+from db.database import create_job, set_wizard_state
+from core.mcp_wizard import MCP_BLUEPRINTS, handle_wizard_input
 import os
 import json
+import asyncio
 import fcntl
-from datetime import datetime
+import errno
+import logging
+import shutil
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 import re
 
+_FJ_ID = re.compile(r"FOUNDER_JOB-(\d+)")
+_MAX_CLAIM_ATTEMPTS = 20
+_INBOX_LIST_LIMIT = 20
+_NAME_SANITIZE = re.compile(r'[^a-zA-Z0-9 _-]')
+_SLUG_SANITIZE = re.compile(r'[^a-zA-Z0-9-]')
+# Store folders that never hold installable assets — skipped before descent
+_STORE_SKIP_DIRS = frozenset({"node_modules", "__pycache__"})
+_COPY_IGNORE = shutil.ignore_patterns(".git", *_STORE_SKIP_DIRS)
+_MODE_MAP = {"1": "FULL DISCOVERY", "2": "QUICK START", "3": "JUST BUILD"}
+_MODE_KEYWORDS = (
+    (("1", "discovery"), "FULL DISCOVERY"),
+    (("2", "quick"), "QUICK START"),
+    (("3", "just", "build"), "JUST BUILD"),
+)
+# copy_file_range errors that just mean "this filesystem can't do it" — fall back to copy2
+_CLONE_UNSUPPORTED = frozenset({errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL})
+_MD_TABLE = str.maketrans({ch: f'\\{ch}' for ch in '*_`[]()~>#+-=|{}.!'})
+
+
+def _clone_file(src: str, dst: str) -> str:
+    """copytree copy_function: copy_file_range lets the kernel reflink (btrfs/xfs)
+    or copy in-kernel; anything else falls back to shutil.copy2."""
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            shutil.copystat(src, dst)
+            return dst
+        except OSError as e:
+            if e.errno not in _CLONE_UNSUPPORTED:
+                raise
+    return shutil.copy2(src, dst)
+
 class OrchestratorAgent(BaseAgent):
     """
     The brain of Omega Claw.
@@ -22,6 +67,11 @@ class OrchestratorAgent(BaseAgent):
     FORBIDDEN_ACTIONS = ["Execute shell commands", "Read files outside hive/", "Send network requests", "Delete files"]
     MAX_BLAST_RADIUS = "Can create .md files in telegram_inbox/ and write to SQLite. Cannot execute code or access network."
     
+    # Shared by all instances: store copies run off the Telegram event loop
+    _install_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="omega-install")
+    # Directories already created this process — skips a mkdir syscall per instance/install
+    _dirs_ensured = set()
+    
     def __init__(self):
         super().__init__()
         self.hive_dir = os.path.expanduser(os.getenv(
@@ -30,8 +80,14 @@ class OrchestratorAgent(BaseAgent):
         ))
         self.telegram_inbox = os.path.join(self.hive_dir, "telegram_inbox")
         self.state_file = os.path.join(self.telegram_inbox, "active_conversations.json")
+        self._next_id = None  # Lazily seeded from disk, then incremented in memory
+        self._taken_ids = set()  # Job numbers found in the inbox at seeding, plus every id claimed since
+        self._state_cache = None  # In-memory copy of state_file; disk is only read once
+        self._store_index = None  # Omega Store folder index, rebuilt when _store_stamp changes
+        self._store_mtime = None
+        self._installs = {}  # dest path -> Future of the running copy
         
-        Path(self.telegram_inbox).mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(self.telegram_inbox)
         
         self.questions = [
             {"key": "name",     "prompt": "📝 **Step 1/4: Project Name**\nWhat are we building? (e.g. TaskFlow, CryptoBot)"},
@@ -42,31 +98,46 @@ class OrchestratorAgent(BaseAgent):
 
     def _build_registry(self):
         self.registry = {
-            "orchestrator:build":  lambda user_text="", **kw: self._handle_build_flow(user_text),
-            "orchestrator:status": lambda **kw: self._check_inbox(),
-            "orchestrator:cancel": lambda **kw: self._cancel_flow(),
-            "orchestrator:install": lambda user_text="", **kw: self._handle_install(user_text),
+            "orchestrator:build":  lambda intent, user_text="", **kw: self._handle_build_flow(user_text),
+            "orchestrator:status": lambda intent, **kw: self._check_inbox(),
+            "orchestrator:cancel": lambda intent, **kw: self._cancel_flow(),
+            "orchestrator:install": lambda intent, user_text="", user_id=None, **kw: self._handle_install(user_text, user_id),
         }
 
     # --- State Management (SECURITY §3.7: File locking) ---
     
     def _load_state(self):
-        if os.path.exists(self.state_file):
-            try:
+        if self._state_cache is not None:
+            return self._state_cache
+        data = {}
+        try:
+            # Empty file is a leftover from an interrupted write — treat as fresh
+            if os.path.getsize(self.state_file) > 0:
+                # No read lock needed: writers swap the file in atomically
                 with open(self.state_file, 'r') as f:
-                    fcntl.flock(f, fcntl.LOCK_SH)  # Shared lock for reads
                     data = json.load(f)
-                    fcntl.flock(f, fcntl.LOCK_UN)
-                    return data
-            except:
-                return {}
-        return {}
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(f"{self.name}: Could not load state from {self.state_file}: {e}")
+            data = {}
+        self._state_cache = data
+        return data
 
     def _save_state(self, state):
-        with open(self.state_file, 'w') as f:
+        # Write-through: the cache serves reads, the file survives restarts
+        if self._next_id is not None:
+            state["next_id"] = self._next_id
+        self._state_cache = state
+        # Write to a temp file and swap it in so a crash never leaves a truncated file
+        tmp = f"{self.state_file}.tmp.{os.getpid()}"
+        with open(tmp, 'w') as f:
             fcntl.flock(f, fcntl.LOCK_EX)  # Exclusive lock for writes
             json.dump(state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
             fcntl.flock(f, fcntl.LOCK_UN)
+        os.replace(tmp, self.state_file)
 
     # --- Flow Logic ---
 
@@ -101,7 +172,7 @@ class OrchestratorAgent(BaseAgent):
         
         # SECURITY §2.1: Validate project name — allowlist only
         name = answers.get("name", "").strip()
-        name = re.sub(r'[^a-zA-Z0-9 _-]', '', name)[:50]
+        name = _NAME_SANITIZE.sub('', name)[:50]
         if not name:
             return "❌ Invalid project name. Use letters, numbers, spaces only."
         answers["name"] = name
@@ -109,20 +180,19 @@ class OrchestratorAgent(BaseAgent):
         return self._generate_founder_job(answers)
 
     def _generate_founder_job(self, answers: dict) -> str:
-        job_id = f"FOUNDER_JOB-{self._get_next_id():03d}"
         slug = self._slugify(answers["name"])
-        job_file = os.path.join(self.telegram_inbox, f"{job_id}-{slug}.md")
+        job_id, fd = self._claim_job_file(slug)
+        if fd is None:
+            return "❌ Could not allocate a job id. Check the telegram_inbox folder."
+        # Persist the counter only now that the id is taken, so a restart never reissues it
+        self._save_state(self._load_state())
         
-        # Normalize mode
-        mode = answers["mode"]
-        if "1" in mode or "discovery" in mode.lower(): mode = "FULL DISCOVERY"
-        elif "2" in mode or "quick" in mode.lower():   mode = "QUICK START"
-        elif "3" in mode or "just" in mode.lower() or "build" in mode.lower(): mode = "JUST BUILD"
+        mode = self._normalize_mode(answers["mode"])
 
         content = f"""# {job_id}: {answers["name"]}
 
 **STATUS**: PENDING
-**CREATED**: {datetime.now().isoformat()}
+**CREATED**: {datetime.now(timezone.utc).isoformat(timespec='seconds')}
 **DELEGATED TO**: Claude Code (Master Orchestrator / Founder)
 
 ---
@@ -154,7 +224,7 @@ This is a brand new project dropped from the human pilot's Telegram.
 ---
 *Progress will be monitored via the `master-job-board.md`.*
 """
-        with open(job_file, 'w') as f:
+        with os.fdopen(fd, 'w') as f:
             f.write(content)
         
         # Log to SQLite
@@ -169,89 +239,96 @@ This is a brand new project dropped from the human pilot's Telegram.
             f"Use `status` to check progress."
         )
 
+    def _claim_job_file(self, slug: str):
+        """Create the job file exclusively so concurrent writers never clobber each other.
+        Returns (job_id, fd), bumping the id on collision. Numbers are checked against
+        the in-memory _taken_ids, so a job of the same number under a different slug is
+        skipped too without rescanning the inbox."""
+        for _ in range(_MAX_CLAIM_ATTEMPTS):
+            job_num = self._get_next_id()
+            if job_num in self._taken_ids:
+                continue
+            self._taken_ids.add(job_num)
+            job_id = f"FOUNDER_JOB-{job_num:03d}"
+            job_file = os.path.join(self.telegram_inbox, f"{job_id}-{slug}.md")
+            try:
+                return job_id, os.open(job_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                continue
+        return None, None
+
     def _cancel_flow(self) -> str:
         self._save_state({"active": False, "step": 0, "answers": {}})
         return "🛑 **Setup Cancelled.** Ready for new commands."
 
     def _check_inbox(self) -> str:
-        if not os.path.exists(self.telegram_inbox):
+        try:
+            with os.scandir(self.telegram_inbox) as it:
+                jobs = [e.name for e in it if e.name.startswith("FOUNDER_JOB") and e.name.endswith(".md")]
+        except FileNotFoundError:
             return "📋 **Inbox**: Empty"
-        jobs = sorted([f for f in os.listdir(self.telegram_inbox) if f.startswith("FOUNDER_JOB") and f.endswith(".md")])
         if not jobs:
             return "📋 **Inbox**: No pending jobs."
-        lines = [f"• {j.replace('.md', '')}" for j in jobs]
+        jobs.sort(key=self._job_sort_key)
+        # Most recent jobs only, to keep the Telegram message bounded
+        lines = [f"• {j.replace('.md', '')}" for j in jobs[-_INBOX_LIST_LIMIT:]]
         return f"📋 **Inbox** ({len(jobs)} jobs)\n\n" + "\n".join(lines)
 
     def _handle_install(self, user_text: str, user_id: int = None) -> str:
-        import shutil
         # parse: "install plugin name"
         query = user_text.lower().replace("install", "").replace("add kit", "").replace("fetch skill", "").replace("get mcp", "").strip()
         if not query:
             return "❌ What would you like to install? Example: `install postgres skill`"
             
         # 1. Check if this is a built-in MCP wizard blueprint
-        from core.mcp_wizard import MCP_BLUEPRINTS
-        for blueprint_id in MCP_BLUEPRINTS:
-            if blueprint_id in query:
-                from db.database import set_wizard_state
-                if not user_id:
-                    return f"⚙️ **MCP Installation Detected**\n\nYou requested the `{blueprint_id}` MCP, but I couldn't identify your Telegram session."
-                state = {"mcp_id": blueprint_id, "step": 0, "answers": {}}
-                set_wizard_state(user_id, state)
-                from core.mcp_wizard import handle_wizard_input
-                return handle_wizard_input(user_id, "", state)
+        # Whole-word hits are O(1) dict lookups; the substring scan only runs as a fallback
+        blueprint_id = next((t for t in query.split() if t in MCP_BLUEPRINTS), None) \
+            or next((b for b in MCP_BLUEPRINTS if b in query), None)
+        if blueprint_id:
+            if not user_id:
+                return f"⚙️ **MCP Installation Detected**\n\nYou requested the `{blueprint_id}` MCP, but I couldn't identify your Telegram session."
+            state = {"mcp_id": blueprint_id, "step": 0, "answers": {}}
+            set_wizard_state(user_id, state)
+            return handle_wizard_input(user_id, "", state)
         
         # 2. Search the Omega Store for files
         store_path = os.path.expanduser("~/Documents/Omega Constitution Pack/Omega System Public/Constution Store v1/omega-store")
-        if not os.path.exists(store_path):
+        index = self._get_store_index(store_path)
+        if index is None:
             return "❌ Omega Store repository not found on disk."
             
         # Search the store for a generic match
-        matches = []
-        for root, dirs, files in os.walk(store_path):
-            if ".git" in root: continue
-            # Try to match a folder name conceptually
-            dirname = os.path.basename(root).lower()
-            if query in dirname or dirname in query.replace(" ", "-"):
-                matches.append(root)
-
-        # Filter out parent directories if child is matched (simplified search)
-        if not matches:
+        match = self._find_asset(index, query)
+        if not match:
             return f"❌ Could not find an asset matching `{query}` in the Omega Store."
             
-        # Just take the best/first match for now
-        target = matches[0]
+        target, parent = match
         name = os.path.basename(target)
-        parent = os.path.basename(os.path.dirname(target))
         
         if parent == "skills":
             dest = os.path.expanduser("~/Documents/omega-claw/skills")
-            os.makedirs(dest, exist_ok=True)
-            try:
-                shutil.copytree(target, os.path.join(dest, name), dirs_exist_ok=True)
-                return f"✅ **Skill Installed!**\n\nThe `{name}` skill has been injected into Omega Claw. Restart the bot to load new intents."
-            except Exception as e:
-                return f"❌ Failed to install skill: {e}"
+            self._ensure_dir(dest)
+            return self._copy_in_background(
+                "skill", name, target, os.path.join(dest, name), user_id,
+                f"⏳ **Installing Skill...**\n\nThe `{name}` skill is being injected into Omega Claw. I'll message you when it lands; restart the bot then to load new intents."
+            )
                 
         elif parent in ["examples", "kits", "seeds"]:
             dest = os.path.join(self.hive_dir, "../seeds", name)
-            os.makedirs(dest, exist_ok=True)
-            try:
-                shutil.copytree(target, dest, dirs_exist_ok=True)
-                return f"✅ **Kit Installed!**\n\nThe `{name}` kit has been staged in your active workspace seeds. You can now use it in your next build."
-            except Exception as e:
-                return f"❌ Failed to install kit: {e}"
+            self._ensure_dir(dest)
+            return self._copy_in_background(
+                "kit", name, target, dest, user_id,
+                f"⏳ **Installing Kit...**\n\nThe `{name}` kit is being staged in your active workspace seeds. I'll message you when it's ready for your next build."
+            )
                 
         elif parent == "mcps":
             mcp_id = name.replace("-mcp.json", "").replace(".json", "")
-            from db.database import set_wizard_state
             if not user_id:
                 return f"⚙️ **MCP Installation Detected**\n\nYou requested the `{name}` MCP, but I couldn't identify your Telegram session to start the wizard."
             
             state = {"mcp_id": mcp_id, "step": 0, "answers": {}}
             set_wizard_state(user_id, state)
             
-            from core.mcp_wizard import handle_wizard_input
             return handle_wizard_input(user_id, "", state)
             
         else:
@@ -259,23 +336,160 @@ This is a brand new project dropped from the human pilot's Telegram.
 
     # --- Helpers ---
     
+    @classmethod
+    def _ensure_dir(cls, path: str):
+        if path not in cls._dirs_ensured:
+            Path(path).mkdir(parents=True, exist_ok=True)
+            cls._dirs_ensured.add(path)
+
+    def _copy_in_background(self, kind: str, name: str, target: str, dest: str, user_id: int, ack: str) -> str:
+        """Run copytree on the shared install pool so the bot keeps answering messages."""
+        pending = self._installs.get(dest)
+        if pending and not pending.done():
+            return f"⏳ The `{name}` {kind} is already being installed."
+        try:
+            # execute() runs on the bot loop; capture it so the worker can report back
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        future = self._install_pool.submit(
+            shutil.copytree, target, dest, dirs_exist_ok=True, ignore=_COPY_IGNORE,
+            copy_function=_clone_file
+        )
+        self._installs[dest] = future
+        future.add_done_callback(lambda f: self._on_copy_done(kind, name, dest, user_id, loop, f))
+        return ack
+
+    def _on_copy_done(self, kind: str, name: str, dest: str, user_id: int, loop, future: Future):
+        if self._installs.get(dest) is future:
+            del self._installs[dest]
+        error = future.exception()
+        if error:
+            logging.error(f"{self.name}: Failed to install {kind} '{name}': {error}")
+            text = f"❌ Failed to install {kind} `{name}`: {error}"
+        else:
+            logging.info(f"{self.name}: Installed {kind} '{name}'")
+            text = f"✅ Installed {kind} `{name}`."
+        if loop is None or loop.is_closed():
+            return
+        # Imported here: core.telegram_bot imports the orchestrator, which loads this agent
+        from core.telegram_bot import send_telegram_message
+        asyncio.run_coroutine_threadsafe(send_telegram_message(user_id, text), loop)
+
+    def _get_store_index(self, store_path: str):
+        """Return the cached store index, rebuilding it when the store's stamp changes."""
+        stamp = self._store_stamp(store_path)
+        if stamp is None:
+            return None
+        if self._store_index is None or stamp != self._store_mtime:
+            self._store_index = self._build_store_index(store_path)
+            self._store_mtime = stamp
+        return self._store_index
+
+    @staticmethod
+    def _store_stamp(store_path: str):
+        """
+        Newest mtime among the store root, its top-level folders and .git/index/HEAD.
+        A `git pull` that adds skills/<new> only touches skills/ and the git index,
+        never the root, so the root mtime alone would miss it. None if the store is gone.
+        """
+        try:
+            stamp = os.stat(store_path).st_mtime_ns
+            with os.scandir(store_path) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False) and not e.name.startswith("."):
+                        stamp = max(stamp, e.stat(follow_symlinks=False).st_mtime_ns)
+        except FileNotFoundError:
+            return None
+        for name in ("index", "HEAD"):
+            try:
+                stamp = max(stamp, os.stat(os.path.join(store_path, ".git", name)).st_mtime_ns)
+            except OSError:
+                pass
+        return stamp
+
+    @staticmethod
+    def _build_store_index(store_path: str) -> dict:
+        """Breadth-first walk of the store: folder name -> [(path, parent name)].
+        Hidden folders (.git etc.) are pruned before descent."""
+        index = {}
+        queue = deque([store_path])
+        while queue:
+            parent_dir = queue.popleft()
+            try:
+                # Prune before sorting/descending so .git and friends are never entered
+                with os.scandir(parent_dir) as it:
+                    entries = sorted(
+                        (e for e in it
+                         if not e.name.startswith(".") and e.name not in _STORE_SKIP_DIRS
+                         and e.is_dir(follow_symlinks=False)),
+                        key=lambda e: e.name
+                    )
+            except OSError:
+                continue
+            parent = os.path.basename(parent_dir)
+            for e in entries:
+                index.setdefault(e.name.lower(), []).append((e.path, parent))
+                queue.append(e.path)
+        return index
+
+    @staticmethod
+    def _find_asset(index: dict, query: str):
+        """Return the first (path, parent) whose folder name matches the query."""
+        slug = query.replace(" ", "-")
+        for dirname, hits in index.items():
+            # Try to match a folder name conceptually
+            if query in dirname or dirname in slug:
+                return hits[0]
+        return None
+
     def _get_next_id(self) -> int:
-        max_id = 0
-        if os.path.exists(self.telegram_inbox):
-            for f in os.listdir(self.telegram_inbox):
-                match = re.match(r"FOUNDER_JOB-(\d+)", f)
-                if match:
-                    max_id = max(max_id, int(match.group(1)))
-        return max_id + 1
+        # Scan the inbox once, then serve ids from memory. The persisted counter
+        # covers restarts; taking the max guards against jobs dropped externally.
+        if self._next_id is None:
+            self._taken_ids = self._scan_ids()
+            self._next_id = max(max(self._taken_ids, default=0) + 1, self._load_state().get("next_id", 1))
+        job_num = self._next_id
+        self._next_id += 1
+        return job_num
+
+    def _scan_ids(self) -> set:
+        """Numbers of the FOUNDER_JOB files currently in the inbox."""
+        ids = set()
+        try:
+            with os.scandir(self.telegram_inbox) as it:
+                for e in it:
+                    match = _FJ_ID.match(e.name)
+                    if match:
+                        ids.add(int(match.group(1)))
+        except FileNotFoundError:
+            pass
+        return ids
+
+    @staticmethod
+    def _normalize_mode(mode: str) -> str:
+        # Fast path: the wizard asks for `1`/`2`/`3`, so the first character usually decides
+        label = _MODE_MAP.get(mode.strip()[:1])
+        if label:
+            return label
+        lowered = mode.lower()
+        for keywords, label in _MODE_KEYWORDS:
+            if any(k in lowered for k in keywords):
+                return label
+        return mode
+
+    @staticmethod
+    def _job_sort_key(filename: str):
+        # Numeric id order stays correct past FOUNDER_JOB-999, where zero-padding runs out
+        match = _FJ_ID.match(filename)
+        return (int(match.group(1)) if match else 0, filename)
 
     def _slugify(self, text: str) -> str:
         words = text.split()[:3]
         slug = "-".join(words)
-        return re.sub(r'[^a-zA-Z0-9-]', '', slug).title()
+        return _SLUG_SANITIZE.sub('', slug).title()
 
     # SECURITY §2.2: Escape Markdown special characters in user input
     @staticmethod
     def _escape_md(text: str) -> str:
-        for ch in ['*', '_', '`', '[', ']', '(', ')', '~', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']:
-            text = text.replace(ch, f'\\{ch}')
-        return text
+        return text.translate(_MD_TABLE)
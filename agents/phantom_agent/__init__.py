@@ -3,14 +3,180 @@
 # CONFIRMED WORKING: osascript focus + pyautogui typing tested successfully.
 
 import pyautogui
+from PIL import Image, ImageChops, ImageStat  # Ships with pyautogui (via pyscreeze)
 import subprocess
 import time
 import logging
 import os
-from typing import Callable, Optional
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+try:
+    from AppKit import NSScreen
+    APPKIT_AVAILABLE = True
+except ImportError:
+    APPKIT_AVAILABLE = False
+
+# Optional: pyobjc Accessibility bridge — activate/resize windows in-process instead of spawning osascript
+try:
+    from AppKit import NSWorkspace, NSApplicationActivateIgnoringOtherApps
+    from ApplicationServices import (
+        AXUIElementCreateApplication, AXUIElementCopyAttributeValue, AXUIElementSetAttributeValue,
+        AXValueCreate, kAXErrorSuccess, kAXWindowsAttribute, kAXPositionAttribute, kAXSizeAttribute,
+        kAXValueCGPointType, kAXValueCGSizeType,
+    )
+    from Quartz import CGPoint, CGSize
+    AX_AVAILABLE = True
+except ImportError:
+    AX_AVAILABLE = False
+
+try:
+    import pytesseract
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+
+# Optional: pyahocorasick matches every keyword in one pass over the OCR text
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Optional: mss grabs frames via CoreGraphics directly — no screencapture subprocess or temp file
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
+# Optional: pyperclip lets prompts be pasted in one Cmd+V instead of typed key by key
+try:
+    import pyperclip
+    PYPERCLIP_AVAILABLE = True
+except ImportError:
+    PYPERCLIP_AVAILABLE = False
+
+# Optional: xxhash for cheap screen fingerprints (falls back to the builtin hash)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+
+_BINARIZE = [0] * 128 + [255] * 128  # Grayscale -> 1-bit threshold table for PIL point()
+
+
+def _fingerprint(data) -> int:
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh64(data).intdigest()
+    return hash(data)
+
+
+# AppleScripts are compiled once per process with osacompile and run from the .scpt,
+# so each call skips osascript's parse/compile step. Values arrive via argv.
+_APPLESCRIPTS = {
+    "focus": '''
+on run argv
+    set appName to item 1 of argv
+    tell application "System Events"
+        if exists application process appName then
+            tell application appName to activate
+            return "SUCCESS"
+        else
+            return "FAIL"
+        end if
+    end tell
+end run
+''',
+    "resize": '''
+on run argv
+    set processName to item 1 of argv
+    set targetX to (item 2 of argv) as integer
+    set targetY to (item 3 of argv) as integer
+    set targetW to (item 4 of argv) as integer
+    set targetH to (item 5 of argv) as integer
+    tell application "System Events"
+        if exists application process processName then
+            set theWindow to window 1 of application process processName
+            set position of theWindow to {targetX, targetY}
+            set size of theWindow to {targetW, targetH}
+            return "SUCCESS"
+        else
+            return "FAIL"
+        end if
+    end tell
+end run
+''',
+    "focus_browser": '''
+on run argv
+    tell application "System Events"
+        if exists application process "Google Chrome" then
+            tell application "Google Chrome" to activate
+            return "SUCCESS"
+        else if exists application process "Safari" then
+            tell application "Safari" to activate
+            return "SUCCESS"
+        else
+            return "FAIL"
+        end if
+    end tell
+end run
+''',
+}
+_compiled_scripts = {}  # script name -> compiled .scpt path (None if osacompile failed)
+
+
+def _run_applescript(name: str, *args) -> subprocess.CompletedProcess:
+    """Run one of _APPLESCRIPTS, compiling it on first use; falls back to osascript -e."""
+    if name not in _compiled_scripts:
+        path = os.path.join(tempfile.gettempdir(), f"omega-phantom-{os.getpid()}-{name}.scpt")
+        try:
+            subprocess.run(['osacompile', '-o', path, '-e', _APPLESCRIPTS[name]],
+                           check=True, capture_output=True)
+            _compiled_scripts[name] = path
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"[Ghost] osacompile failed for '{name}', running uncompiled: {e}")
+            _compiled_scripts[name] = None
+    path = _compiled_scripts[name]
+    cmd = ['osascript', path] if path else ['osascript', '-e', _APPLESCRIPTS[name]]
+    return subprocess.run(cmd + [str(a) for a in args], capture_output=True, text=True)
+
+
+def _running_app(name: str):
+    """NSRunningApplication whose localized name is `name`, or None."""
+    for app in NSWorkspace.sharedWorkspace().runningApplications():
+        if app.localizedName() == name:
+            return app
+    return None
+
+
+def _ax_activate(name: str) -> bool:
+    app = _running_app(name)
+    return bool(app and app.activateWithOptions_(NSApplicationActivateIgnoringOtherApps))
+
+
+def _ax_set_frame(name: str, x: int, y: int, w: int, h: int) -> bool:
+    """Move/resize the app's front window through the Accessibility API."""
+    app = _running_app(name)
+    if app is None:
+        return False
+    element = AXUIElementCreateApplication(app.processIdentifier())
+    err, windows = AXUIElementCopyAttributeValue(element, kAXWindowsAttribute, None)
+    if err != kAXErrorSuccess or not windows:
+        return False
+    window = windows[0]
+    err_pos = AXUIElementSetAttributeValue(
+        window, kAXPositionAttribute, AXValueCreate(kAXValueCGPointType, CGPoint(x, y)))
+    err_size = AXUIElementSetAttributeValue(
+        window, kAXSizeAttribute, AXValueCreate(kAXValueCGSizeType, CGSize(w, h)))
+    return err_pos == kAXErrorSuccess and err_size == kAXErrorSuccess
+
 # SECURITY WARNING: This script takes physical control of the host machine's mouse and keyboard.
 # The user must not touch the machine while Vector 2 is executing.
 
@@ -30,18 +196,34 @@ class PhantomAgent:
     CRASH_KEYWORDS = ["not responding", "keep waiting", "wait", "unresponsive"]
     DONE_KEYWORDS = ["task completed", "finished", "done", "all changes applied"]
 
+    # Frame labels in dispatch priority: each scan is classified as the first one it hits, else "ok"
+    FRAME_LABELS = ("allow", "limit", "crash", "done")
+
+    # Screen regions OCR'd by the Vision Loop
+    VISION_REGIONS = ("dialog_region", "chat_region", "status_region")
+    # Keyword spotting only: skip the dictionary passes, they just "correct" UI strings
+    OCR_CONFIG = "--psm 6 -l eng -c load_system_dawg=0 -c load_freq_dawg=0"
+    MAX_POLL_INTERVAL = 60  # Ceiling for the idle backoff between vision scans (seconds)
+    KEY_SETTLE = 0.05  # Pause after keystrokes the UI must process before the next one (seconds)
+
     def __init__(self, target_app_name: str = "Antigravity", poll_interval: int = 5):
         self.target_app_name = target_app_name
         self.is_focused = False
         self.poll_interval = poll_interval  # seconds between vision scans
         self.running = False
-        self._on_limit_callback: Optional[Callable] = None
-        self._on_done_callback: Optional[Callable] = None
+        self._handlers: Dict[str, Callable] = {}  # frame label -> caller's handler (vision loop)
         self._landmarks = self._load_landmarks()
+        self._monitor_layout = None  # Cached NSScreen frames; see invalidate_monitor_cache()
+        self._landmark_abs_cache = None  # landmark name -> (abs_x, abs_y) for that layout
+        self._sct = None  # Reused mss handle, created on first grab
+        self._ocr_cache = {}  # capture box -> (thumbnail fingerprint, OCR text)
+        # Each region gets its own Tesseract process; the wait releases the GIL so they run in parallel
+        self._ocr_pool = ThreadPoolExecutor(max_workers=len(self.VISION_REGIONS), thread_name_prefix="ghost-ocr")
+        self._build_keyword_matcher()
 
         # PyAutoGUI safety features
         pyautogui.FAILSAFE = True   # Move mouse to any corner to emergency abort
-        pyautogui.PAUSE = 0.3       # Slight delay after every PyAutoGUI call
+        pyautogui.PAUSE = 0         # No global per-call delay; waits are explicit (KEY_SETTLE etc.)
 
     def _load_landmarks(self) -> dict:
         """Load the UI coordinates from landmarks.json."""
@@ -55,7 +237,16 @@ class PhantomAgent:
             return {}
 
     def _get_landmark_coords(self, landmark_name: str):
-        """Calculates absolute coordinates for a landmark based on second monitor detection."""
+        """Returns absolute coordinates for a landmark, precomputed once per monitor layout."""
+        if self._landmark_abs_cache is None:
+            self._landmark_abs_cache = self._compute_landmark_coords()
+        coords = self._landmark_abs_cache.get(landmark_name)
+        if coords is None:
+            logger.warning(f"[Ghost] No landmark '{landmark_name}' for the current monitor layout")
+        return coords
+
+    def _compute_landmark_coords(self) -> dict:
+        """Calculates absolute coordinates for every landmark based on second monitor detection."""
         layout = self._get_monitor_layout()
         # Default to primary if no secondary found
         screen = layout[0]
@@ -65,28 +256,36 @@ class PhantomAgent:
             # Secondary monitor (usually the leftmost one as per earlier detection)
             screen = min(layout, key=lambda s: s["x"])
             res_key = f"{int(screen['w'])}x{int(screen['h'])}_secondary"
-        
-        landmarks = self._landmarks.get(res_key, {})
-        data = landmarks.get(landmark_name)
-        
-        if not data:
-            logger.warning(f"[Ghost] No landmark '{landmark_name}' for resolution {res_key}")
-            # Fallback to secondary 1920x1080 defaults if possible
-            data = self._landmarks.get("1920x1080_secondary", {}).get(landmark_name)
-
-        if data:
-            abs_x = screen["x"] + (screen["w"] * data["x_rel"])
-            abs_y = screen["y"] + (screen["h"] * data["y_rel"])
-            return int(abs_x), int(abs_y)
-        
-        return None
+
+        if res_key not in self._landmarks:
+            logger.warning(f"[Ghost] No landmarks for resolution {res_key}, using 1920x1080 defaults")
+        # Fallback to secondary 1920x1080 defaults for anything this resolution lacks
+        landmarks = {**self._landmarks.get("1920x1080_secondary", {}), **self._landmarks.get(res_key, {})}
+
+        coords = {}
+        for name, data in landmarks.items():
+            abs_x = int(screen["x"] + (screen["w"] * data["x_rel"]))
+            abs_y = int(screen["y"] + (screen["h"] * data["y_rel"]))
+            if "w_rel" in data:
+                # Region landmark -> (x, y, w, h) box for cropped screenshots
+                coords[name] = (abs_x, abs_y, int(screen["w"] * data["w_rel"]), int(screen["h"] * data["h_rel"]))
+            else:
+                coords[name] = (abs_x, abs_y)
+        return coords
 
     # ─── WINDOW CONTROL ───────────────────────────────────────────
 
     def _get_monitor_layout(self):
-        """Detects all connected screens and their frames using AppKit."""
+        """
+        Detects all connected screens and their frames using AppKit.
+        The result is cached — the NSScreen bridge round-trip is expensive and
+        monitors rarely change mid-session. Call invalidate_monitor_cache() to refresh.
+        """
+        if self._monitor_layout is not None:
+            return self._monitor_layout
         try:
-            from AppKit import NSScreen
+            if not APPKIT_AVAILABLE:
+                raise ImportError("AppKit (pyobjc) not installed")
             screens = NSScreen.screens()
             layout = []
             for s in screens:
@@ -97,10 +296,16 @@ class PhantomAgent:
                     "w": f.size.width,
                     "h": f.size.height
                 })
-            return layout
         except Exception as e:
             logger.warning(f"[Ghost] Could not detect monitor layout: {e}")
-            return [{"x": 0, "y": 0, "w": 1920, "h": 1080}]
+            layout = [{"x": 0, "y": 0, "w": 1920, "h": 1080}]
+        self._monitor_layout = layout
+        return layout
+
+    def invalidate_monitor_cache(self):
+        """Forget the cached monitor layout so the next lookup re-queries AppKit."""
+        self._monitor_layout = None
+        self._landmark_abs_cache = None
 
     def wait_for_active(self, timeout_seconds: int = 30) -> bool:
         """
@@ -128,7 +333,8 @@ class PhantomAgent:
 
     def force_window_resize(self, width_percent: float = 0.8, height_percent: float = 0.9) -> bool:
         """
-        Uses AppleScript to force the IDE window to a specific percentage of the screen.
+        Forces the IDE window to a specific percentage of the screen (Accessibility API,
+        or AppleScript when pyobjc is missing).
         This ensures Landmarks remain consistent.
         """
         logger.info(f"[Ghost] Forcing window resize for {self.target_app_name}...")
@@ -142,50 +348,35 @@ class PhantomAgent:
         target_x = int(screen["x"] + (screen["w"] - target_w) / 2)
         target_y = int(screen["y"] + (screen["h"] - target_h) / 2)
 
-        script = f'''
-        tell application "System Events"
-            set processName to "{self.target_app_name}"
-            if exists application process processName then
-                set theWindow to window 1 of application process processName
-                set position of theWindow to {{{target_x}, {target_y}}}
-                set size of theWindow to {{{target_w}, {target_h}}}
-                return "SUCCESS"
-            else
-                return "FAIL"
-            end if
-        end tell
-        '''
         try:
-            result = subprocess.run(['osascript', '-e', script], capture_output=True, text=True)
-            if "SUCCESS" in result.stdout:
+            if AX_AVAILABLE:
+                resized = _ax_set_frame(self.target_app_name, target_x, target_y, target_w, target_h)
+            else:
+                result = _run_applescript("resize", self.target_app_name, target_x, target_y, target_w, target_h)
+                resized = "SUCCESS" in result.stdout
+            if resized:
                 logger.info(f"[Ghost] Window resized to {target_w}x{target_h}")
                 time.sleep(1)
                 return True
         except Exception as e:
             logger.error(f"[Ghost] Window resize failed: {e}")
+        finally:
+            self.invalidate_monitor_cache()
         return False
 
     def force_focus(self) -> bool:
         """
-        Uses raw AppleScript (osascript) via subprocess to find the target app and 
-        force it to the absolute front of the screen.
+        Finds the target app and forces it to the absolute front of the screen —
+        via NSRunningApplication when pyobjc is installed, otherwise via osascript.
         """
-        logger.info(f"[Ghost] Attempting AppleScript focus on {self.target_app_name}")
-
-        script = f'''
-        tell application "System Events"
-            if exists application process "{self.target_app_name}" then
-                tell application "{self.target_app_name}" to activate
-                return "SUCCESS"
-            else
-                return "FAIL"
-            end if
-        end tell
-        '''
+        logger.info(f"[Ghost] Attempting focus on {self.target_app_name}")
 
         try:
-            result = subprocess.run(['osascript', '-e', script], capture_output=True, text=True)
-            if "SUCCESS" in result.stdout:
+            if AX_AVAILABLE:
+                focused = _ax_activate(self.target_app_name)
+            else:
+                focused = "SUCCESS" in _run_applescript("focus", self.target_app_name).stdout
+            if focused:
                 logger.info(f"[Ghost] Successfully stole focus for {self.target_app_name}")
                 self.is_focused = True
                 time.sleep(1)
@@ -246,10 +437,28 @@ class PhantomAgent:
             time.sleep(0.8) # Wait for UI transition and key release
 
         logger.info(f"[Ghost] Typing prompt into GUI...")
-        pyautogui.write(prompt, interval=0.01)
+        self._type_text(prompt)
         pyautogui.press('enter')
         logger.info("[Ghost] Prompt injected via ENTER key.")
 
+    def _type_text(self, text: str):
+        """
+        Enters text into the focused field. Pastes it in one Cmd+V when pyperclip is
+        available (restoring the user's clipboard afterwards); otherwise types it.
+        """
+        if not PYPERCLIP_AVAILABLE:
+            pyautogui.write(text, interval=0.01)
+            return
+        try:
+            previous = pyperclip.paste()
+        except Exception:
+            previous = None
+        pyperclip.copy(text)
+        pyautogui.hotkey('command', 'v')
+        time.sleep(0.2)  # Let the target app read the pasteboard before it is restored
+        if previous is not None:
+            pyperclip.copy(previous)
+
     def accept_all_changes(self):
         """Clicks the 'Accept All' button in the IDE to commit file changes."""
         logger.info("[Ghost] Triggering 'Accept All' changes...")
@@ -275,6 +484,7 @@ class PhantomAgent:
             # or use arrow keys.
             for _ in range(model_index):
                 pyautogui.press('up')
+                time.sleep(self.KEY_SETTLE)
             pyautogui.press('enter')
             logger.info("[Ghost] Model switch completed.")
         else:
@@ -303,20 +513,10 @@ class PhantomAgent:
         
         # 1. Switch focus to the browser/AI tool
         # For now, we assume the AI tool is in a browser (e.g., Chrome or Safari)
-        script = f'''
-        tell application "System Events"
-            if exists application process "Google Chrome" then
-                tell application "Google Chrome" to activate
-                return "SUCCESS"
-            else if exists application process "Safari" then
-                tell application "Safari" to activate
-                return "SUCCESS"
-            else
-                return "FAIL"
-            end if
-        end tell
-        '''
-        subprocess.run(['osascript', '-e', script])
+        if AX_AVAILABLE:
+            _ax_activate("Google Chrome") or _ax_activate("Safari")
+        else:
+            _run_applescript("focus_browser")
         time.sleep(1)
 
         # 2. Target secondary monitor + Click Input
@@ -326,10 +526,12 @@ class PhantomAgent:
             time.sleep(0.5)
             # Clear input (Cmd+A -> Backspace)
             pyautogui.hotkey('command', 'a')
+            time.sleep(self.KEY_SETTLE)
             pyautogui.press('backspace')
+            time.sleep(self.KEY_SETTLE)
             
             # 3. Type Instruction
-            pyautogui.write(instruction, interval=0.01)
+            self._type_text(instruction)
             pyautogui.press('enter')
             logger.info("[Ghost] Instruction sent to external AI.")
         else:
@@ -364,34 +566,100 @@ class PhantomAgent:
 
     # ─── COMPUTER VISION (Screen OCR) ─────────────────────────────
 
-    def _screenshot_to_text(self) -> str:
+    def _screenshot_to_text(self, regions: tuple = None) -> str:
         """
-        Takes a screenshot of the entire screen and runs OCR to extract all visible text.
-        Returns the full extracted text as a lowercase string for keyword matching.
+        Runs OCR on the screen and returns the extracted text as a lowercase string.
+        With `regions`, only those landmark boxes are captured (far fewer pixels for
+        Tesseract) and OCR'd concurrently, one worker per box.
+        Falls back to the entire screen when no region boxes are known.
         """
-        try:
-            import pytesseract
-            from PIL import Image
-
-            # Take screenshot
-            screenshot = pyautogui.screenshot()
-            # Run OCR
-            text = pytesseract.image_to_string(screenshot)
-            return text.lower()
-        except ImportError:
+        if not PYTESSERACT_AVAILABLE:
             logger.warning("[Ghost] pytesseract not available. Vision loop disabled.")
             return ""
+        try:
+            boxes = [self._get_landmark_coords(r) for r in regions] if regions else []
+            boxes = tuple(b for b in boxes if b and len(b) == 4)
+            if not boxes:
+                # Take screenshot + run OCR on the full screen
+                return self._ocr(self._grab(), None, "")
+            # Grab on this thread (the mss handle is not thread-safe), OCR on the pool
+            captures = [(self._grab(box), box) for box in boxes]
+            texts = self._ocr_pool.map(lambda c: self._ocr(c[0], c[1], self.OCR_CONFIG), captures)
+            return "\n".join(texts)
         except Exception as e:
             logger.warning(f"[Ghost] OCR failed: {e}")
             return ""
 
-    def _check_for_keywords(self, screen_text: str, keywords: list) -> bool:
-        """Check if any keyword appears in the OCR'd screen text."""
-        for keyword in keywords:
-            if keyword in screen_text:
-                logger.info(f"[Ghost] Detected keyword: '{keyword}'")
-                return True
-        return False
+    def _ocr(self, image, key, config: str) -> str:
+        """
+        OCR one capture, skipping Tesseract entirely when it looks identical to the
+        previous scan of the same box. Fingerprints are box-filtered 64x64 grayscale
+        thumbnails, so small text changes still register.
+        """
+        gray = image.convert("L")
+        fingerprint = _fingerprint(gray.resize((64, 64), Image.BOX).tobytes())
+        cached = self._ocr_cache.get(key)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+        # Binarized input: colour carries no keyword information and slows Tesseract down
+        text = pytesseract.image_to_string(gray.point(_BINARIZE, "1"), config=config).lower()
+        self._ocr_cache[key] = (fingerprint, text)
+        return text
+
+    def frame_thumbnail(self, box: tuple = None):
+        """64x64 box-filtered grayscale thumbnail of the screen (or a box), for frame differencing."""
+        return self._grab(box).convert("L").resize((64, 64), Image.BOX)
+
+    @staticmethod
+    def frame_delta(prev, cur) -> float:
+        """Sum of absolute per-pixel differences between two thumbnails."""
+        return ImageStat.Stat(ImageChops.difference(prev, cur)).sum[0]
+
+    def _grab(self, box: tuple = None):
+        """Capture the screen (or an (x, y, w, h) box) as a PIL image."""
+        if not MSS_AVAILABLE:
+            return pyautogui.screenshot(region=box) if box else pyautogui.screenshot()
+        if self._sct is None:
+            self._sct = mss.mss()
+        if box:
+            x, y, w, h = box
+            monitor = {"left": x, "top": y, "width": w, "height": h}
+        else:
+            monitor = self._sct.monitors[0]  # Union of all screens
+        shot = self._sct.grab(monitor)
+        return Image.frombytes("RGB", shot.size, shot.rgb)
+
+    def _build_keyword_matcher(self):
+        """Compile every watched keyword, tagged with its category, into one matcher."""
+        self._keyword_category = {}
+        for category, keywords in (("allow", self.ALLOW_KEYWORDS), ("limit", self.LIMIT_KEYWORDS),
+                                   ("crash", self.CRASH_KEYWORDS), ("done", self.DONE_KEYWORDS)):
+            for keyword in keywords:
+                self._keyword_category.setdefault(keyword, category)
+
+        self._automaton = None
+        self._keyword_re = None
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, category in self._keyword_category.items():
+                self._automaton.add_word(keyword, (category, keyword))
+            self._automaton.make_automaton()
+        else:
+            # Fallback: a single alternation is still one C-level pass (longest keywords first)
+            ordered = sorted(self._keyword_category, key=len, reverse=True)
+            self._keyword_re = re.compile("|".join(map(re.escape, ordered)))
+
+    def _match_keywords(self, screen_text: str) -> dict:
+        """Scan the OCR'd screen text once. Returns {category: first keyword seen}."""
+        hits = {}
+        if self._automaton is not None:
+            for _, (category, keyword) in self._automaton.iter(screen_text):
+                hits.setdefault(category, keyword)
+        else:
+            for match in self._keyword_re.finditer(screen_text):
+                keyword = match.group(0)
+                hits.setdefault(self._keyword_category[keyword], keyword)
+        return hits
 
     # ─── MOUSE MACROS ─────────────────────────────────────────────
 
@@ -409,6 +677,18 @@ class PhantomAgent:
         except Exception as e:
             logger.error(f"[Ghost] Failed to click Allow: {e}")
 
+    def _click_keep_waiting(self):
+        """
+        When a 'not responding' dialog is detected via OCR, dismiss it with
+        'Keep Waiting' (the dialog's default button) so the build carries on.
+        """
+        logger.info("[Ghost] IDE not responding — attempting to click 'Keep Waiting'...")
+        try:
+            pyautogui.press('enter')
+            logger.info("[Ghost] Pressed ENTER to keep waiting.")
+        except Exception as e:
+            logger.error(f"[Ghost] Failed to click Keep Waiting: {e}")
+
     def _rotate_model(self):
         """
         When a rate limit is detected, trigger a mouse macro to rotate models.
@@ -431,69 +711,76 @@ class PhantomAgent:
 
     # ─── THE MAIN VISION LOOP ─────────────────────────────────────
 
-    def vision_watch_loop(self, on_limit: Callable = None, on_done: Callable = None, on_crash: Callable = None, max_idle_seconds: int = 600):
+    def vision_watch_loop(self, on_limit: Callable = None, on_done: Callable = None, on_crash: Callable = None,
+                          max_idle_seconds: int = 600, handlers: Dict[str, Callable] = None):
         """
         The core ghost loop. Runs continuously while the IDE is building.
+        Each scan is OCR'd once and classified into a single FRAME_LABELS label (or "ok");
+        the agent's own action for that label runs, then `handlers[label]` if given.
+        on_limit / on_done / on_crash are shorthands for the matching handlers.
         Updated: 600s (10m) idle timeout.
         """
-        self._on_limit_callback = on_limit
-        self._on_done_callback = on_done
-        self._on_crash_callback = on_crash
+        self._handlers = {k: v for k, v in (("limit", on_limit), ("done", on_done), ("crash", on_crash)) if v}
+        self._handlers.update(handlers or {})
+        actions = {
+            "allow": self._click_allow_button,
+            "limit": self._rotate_model,
+            "crash": self._click_keep_waiting,
+            "done": lambda: logger.info("[Ghost] Task appears COMPLETE."),
+        }
         self.running = True
 
-        logger.info(f"[Ghost] Vision watch loop STARTED. Polling every {self.poll_interval}s.")
+        logger.info(f"[Ghost] Vision watch loop STARTED. Polling every {self.poll_interval}s "
+                    f"(backing off to {self.MAX_POLL_INTERVAL}s while the screen is unchanged).")
         logger.info(f"[Ghost] Idle timeout: {max_idle_seconds}s (10m).")
 
-        last_screen_text = ""
+        last_screen_hash = None
+        unchanged_cycles = 0
+        sleep_time = self.poll_interval
         idle_since = time.time()
 
         while self.running:
             try:
-                time.sleep(self.poll_interval)
+                time.sleep(sleep_time)
 
-                # Screenshot + OCR
-                screen_text = self._screenshot_to_text()
+                # Screenshot + OCR (dialog, chat and status regions in a single pass)
+                screen_text = self._screenshot_to_text(regions=self.VISION_REGIONS)
                 if not screen_text:
                     continue
 
-                # Check if screen changed (activity detection)
-                if screen_text != last_screen_text:
+                # Check if screen changed (activity detection); back off while it hasn't
+                screen_hash = _fingerprint(screen_text.encode())
+                if screen_hash != last_screen_hash:
                     idle_since = time.time()
-                    last_screen_text = screen_text
-
-                # Priority 1: Auto-approve permission requests
-                if self._check_for_keywords(screen_text, self.ALLOW_KEYWORDS):
-                    self._click_allow_button()
-                    continue
-
-                # Priority 2: Detect rate limits → rotate model
-                if self._check_for_keywords(screen_text, self.LIMIT_KEYWORDS):
-                    self._rotate_model()
-                    if self._on_limit_callback:
-                        self._on_limit_callback()
+                    last_screen_hash = screen_hash
+                    unchanged_cycles = 0
+                else:
+                    unchanged_cycles += 1
+                sleep_time = min(self.poll_interval * (2 ** min(unchanged_cycles, 4)), self.MAX_POLL_INTERVAL)
+
+                # One keyword pass per screen -> one label -> table dispatch
+                hits = self._match_keywords(screen_text)
+                for category, keyword in hits.items():
+                    logger.info(f"[Ghost] Detected keyword: '{keyword}' ({category})")
+                label = next((l for l in self.FRAME_LABELS if l in hits), "ok")
+
+                if label != "ok":
+                    actions[label]()
+                    handler = self._handlers.get(label)
+                    if handler:
+                        handler()
+                    if label == "done":
+                        self.running = False
+                        break
                     continue
 
-                # Priority 2.5: Detect Crashes / Freezes
-                if self._check_for_keywords(screen_text, self.CRASH_KEYWORDS):
-                    self._click_keep_waiting()
-                    if self._on_crash_callback:
-                        self._on_crash_callback()
-                    continue
-
-                # Priority 3: Detect task completion
-                if self._check_for_keywords(screen_text, self.DONE_KEYWORDS):
-                    logger.info("[Ghost] Task appears COMPLETE.")
-                    if self._on_done_callback:
-                        self._on_done_callback()
-                    self.running = False
-                    break
-
-                # Priority 4: Idle timeout
+                # Idle timeout
                 elapsed_idle = time.time() - idle_since
                 if elapsed_idle > max_idle_seconds:
                     logger.info(f"[Ghost] No screen activity for {max_idle_seconds}s. Assuming done.")
-                    if self._on_done_callback:
-                        self._on_done_callback()
+                    handler = self._handlers.get("done")
+                    if handler:
+                        handler()
                     self.running = False
                     break
 
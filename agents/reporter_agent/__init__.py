@@ -4,6 +4,9 @@ from db.database import get_all_jobs
 from datetime import datetime
 import os
 
+# Job status -> icon for the job history listing
+_STATUS_ICONS = {"PENDING": "⏳", "BUILDING": "🔄", "COMPLETE": "✅"}
+
 class ReporterAgent(BaseAgent):
     """
     Reads the Omega Hive and SQLite DB to report status back to Telegram.
@@ -25,28 +28,33 @@ class ReporterAgent(BaseAgent):
     
     def _build_registry(self):
         self.registry = {
-            "report:hive":    lambda **kw: self._hive_status(),
-            "report:jobs":    lambda **kw: self._job_history(),
-            "report:full":    lambda **kw: self._full_report(),
+            "report:hive":    lambda intent, **kw: self._hive_status(),
+            "report:jobs":    lambda intent, **kw: self._job_history(),
+            "report:full":    lambda intent, **kw: self._full_report(),
         }
     
     def _hive_status(self) -> str:
         board = os.path.join(self.hive_dir, "master-job-board.md")
         if not os.path.exists(board):
             return "🐝 **Hive**: Idle — no active jobs on the master board."
-        with open(board, 'r') as f:
-            content = f.read(600)
+        # One read syscall, no buffered text-IO stack for 600 bytes
+        fd = os.open(board, os.O_RDONLY)
+        try:
+            data = os.read(fd, 600)
+        finally:
+            os.close(fd)
+        content = data.decode('utf-8', errors='replace')
         return f"🐝 **Hive Status**\n\n```\n{content}\n```"
     
     def _job_history(self) -> str:
-        jobs = get_all_jobs()
+        jobs = get_all_jobs(limit=10)
         if not jobs:
             return "📋 **Job History**: No jobs recorded yet."
         
-        lines = []
-        for job in jobs[:10]:
-            icon = {"PENDING": "⏳", "BUILDING": "🔄", "COMPLETE": "✅"}.get(job["status"], "❓")
-            lines.append(f"{icon} **{job['id']}** — {job['name']} ({job['status']})")
+        lines = [
+            f"{_STATUS_ICONS.get(job.status, '❓')} **{job.id}** — {job.name} ({job.status})"
+            for job in jobs
+        ]
         
         return f"📋 **Job History** (last {len(lines)})\n\n" + "\n".join(lines)
     
@@ -3,11 +3,24 @@
 
 import pexpect
 import os
+import re
 import logging
+from enum import IntEnum
 from typing import Callable
 
 logger = logging.getLogger(__name__)
 
+# watch_stdout runs these on every line of CLI output
+_PROMPT_RE = re.compile(r'\(y/n\)|approve', re.IGNORECASE)
+_LIMIT_RE = re.compile(r'run out of messages|usage limit', re.IGNORECASE)
+
+
+class Autonomy(IntEnum):
+    FULL = 0
+    SECURITY = 1
+    MANUAL = 2
+
+
 class TerminalAgent:
     def __init__(self, engine_cmd: str = "claude", workspace_root: str = None, autonomy_mode: str = "security"):
         """
@@ -17,6 +30,8 @@ class TerminalAgent:
         self.engine_cmd = engine_cmd
         self.workspace_root = workspace_root or os.path.expanduser("~/Desktop/omega-builds")
         self.autonomy_mode = autonomy_mode
+        # Unknown modes get no auto-handling, same as 'manual'
+        self._mode = Autonomy.__members__.get(autonomy_mode.upper(), Autonomy.MANUAL)
         self.child = None
     
     def spawn(self):
@@ -53,17 +68,17 @@ class TerminalAgent:
                 if not line: break
                 
                 # Intercept (y/n) prompts based on autonomy mode
-                if "(y/n)" in line.lower() or "approve" in line.lower():
-                    if self.autonomy_mode == "full":
+                if _PROMPT_RE.search(line):
+                    if self._mode == Autonomy.FULL:
                         logger.info("[Vector 1] Full Autonomy: Auto-Approve (y)")
                         self.child.sendline("y")
-                    elif self.autonomy_mode == "security":
+                    elif self._mode == Autonomy.SECURITY:
                         # In a real build, we'd parse the command to see if it's safe 
                         # For now, default to manual warning
                         logger.warning(f"[Vector 1] Security Mode: Caught permission request: {line.strip()}")
                 
                 # Detect Claude Pro message limit
-                if "run out of messages" in line.lower() or "usage limit" in line.lower():
+                if _LIMIT_RE.search(line):
                     logger.critical(f"[Vector 1] RATE LIMIT DETECTED! Shutting down {self.engine_cmd}.")
                     self.child.close()
                     limit_callback()
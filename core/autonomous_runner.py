@@ -11,18 +11,37 @@ Supports three invoker modes:
 """
 
 import os
-import subprocess
+import re
+import mmap
+import sys
 import time
 import json
 import asyncio
 import logging
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Optional: filesystem event watchers so jobs/reports/blockers are picked up as soon as
+# they land instead of on the next poll (asyncinotify on Linux, watchdog elsewhere)
+try:
+    from asyncinotify import Inotify, Mask
+    ASYNCINOTIFY_AVAILABLE = sys.platform.startswith("linux")
+except (ImportError, OSError):
+    ASYNCINOTIFY_AVAILABLE = False
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
 
 class InvokerMode(Enum):
     """Available invoker modes."""
@@ -49,6 +68,79 @@ CONSTITUTION_DIR = os.path.expanduser(
 for d in [INBOX_DIR, OUTBOX_DIR, STATE_DIR, BLOCKERS_DIR, PROGRESS_DIR]:
     Path(d).mkdir(parents=True, exist_ok=True)
 
+# Directories whose changes should trigger an immediate scan
+WATCHED_DIRS = (INBOX_DIR, OUTBOX_DIR, BLOCKERS_DIR)
+
+# Simple-mode (-p) job prompt; filled per job in _invoke_simple
+_SIMPLE_PROMPT_TMPL = """You are the Omega Master Orchestrator.
+
+READ THESE FILES IN ORDER:
+1. {job_file}
+2. {constitution_dir}/CONSTITUTION/INSTRUCTOR.xml
+3. {constitution_dir}/USER SPACE/dev-work/hive/MASTER_ORCHESTRATOR.md
+
+EXECUTE:
+1. Claim this job (update STATUS to BUILDING if not already)
+2. Follow the Kit and Mode specified in the job
+3. After each major phase, write progress to: {progress_dir}/{job_id}-progress.md
+4. If you need something from the user (API key, decision, clarification):
+   - Write a blocker file to: {blockers_dir}/{job_id}-blocked.md
+   - Include: what you need, why, and what happens next
+   - STOP and wait (the bot will ask the user)
+5. When complete, update the job STATUS to COMPLETE
+
+Progress format:
+```
+## Phase X: [Name]
+**Status**: COMPLETE | IN_PROGRESS | BLOCKED
+**Summary**: What was done
+**Next**: What happens next
+```
+
+BEGIN NOW.
+"""
+
+# Inbox job files: JOB-* (new format) and FOUNDER_JOB* (legacy)
+_JOB_PREFIXES = ("JOB-", "FOUNDER_JOB")
+
+# "STATUS: X" / "STATUS**: X" markers that a status transition may overwrite
+_STATUS_RE = re.compile(r'(STATUS(?:\*\*)?: )(?:PENDING|BUILDING)')
+
+# Bounds for the adaptive scan interval (seconds); with a watcher running this is
+# only the reconciliation fallback
+POLL_INTERVAL_MIN = 1
+POLL_INTERVAL_MAX = 60
+
+# Idle ceiling while no filesystem watcher is running, when polling is the only signal
+POLL_INTERVAL_UNWATCHED = 10
+
+# Soft cap on remembered sent reports (see _scan_outbox)
+_SENT_REPORTS_MAX = 4096
+
+# Telegram notifications queued within this window are sent together, split
+# to stay under the 4096-character message limit
+TELEGRAM_BATCH_WINDOW = 0.5  # seconds
+TELEGRAM_MAX_CHARS = 4000
+
+# How long stopping waits for queued notifications to go out before dropping them
+TELEGRAM_DRAIN_TIMEOUT = 10  # seconds
+
+# Leading characters of a REPORT-*.md that the Telegram summary is cut from
+_REPORT_HEAD_CHARS = 1500
+
+# A directory modified more recently than this may hold half-written files, so its
+# snapshot isn't cached until it settles (see AutonomousRunner._dir_changed)
+_DIR_SETTLE_NS = 2_000_000_000
+
+
+@dataclass(slots=True)
+class JobEntry:
+    """A job the runner has picked up (one per entry in AutonomousRunner.active_jobs)."""
+    status: str
+    started: str
+    file: str
+    invoker: object = None
+
 
 class AutonomousRunner:
     """
@@ -67,10 +159,17 @@ class AutonomousRunner:
             mode: Invoker mode - "simple", "interactive", or "script"
         """
         self.telegram_callback = telegram_callback
-        self.active_jobs = {}  # job_id -> {"status": "...", "user_id": ..., "invoker": ...}
-        self.sent_reports = set()  # Track reports already sent to Telegram
+        self.active_jobs: Dict[str, JobEntry] = {}  # job_id -> JobEntry
+        self.sent_reports = OrderedDict()  # (st_dev, st_ino) of reports already sent, oldest first
+        self._seen_blockers = set()  # Blocker filenames already relayed to Telegram
+        self._dir_state = {}  # dir -> st_mtime_ns at the last settled scan
+        self._answer_events = {}  # job_id -> asyncio.Event set when its answer file is written
+        self._tasks: set = set()  # In-flight _invoke_by_mode tasks, awaited by stop()
         self.running = False
-        self.poll_interval = 10  # seconds
+        self.poll_interval = 10  # seconds; adapted each tick between POLL_INTERVAL_MIN and _MAX
+        self._wake: Optional[asyncio.Event] = None  # Set by the filesystem watcher
+        self._watching = False  # True only while a filesystem watcher is delivering events
+        self._tg_queue: Optional[asyncio.Queue] = None  # (user_id, message) awaiting _telegram_sender
 
         # Determine mode from env or parameter
         mode_str = mode or os.getenv("OMEGA_INVOKER_MODE", "script")
@@ -85,34 +184,226 @@ class AutonomousRunner:
     async def start(self):
         """Start the autonomous watcher loop."""
         self.running = True
+        self._wake = asyncio.Event()
+        self._tg_queue = asyncio.Queue()
+        sender = asyncio.create_task(self._telegram_sender())
+        stop_watcher = self._start_watcher()
         logger.info("AutonomousRunner started")
 
-        while self.running:
-            try:
-                await self._check_for_new_jobs()
-                await self._check_outbox()      # Watch for Claude's reports
-                await self._check_blockers()
-            except Exception as e:
-                logger.error(f"AutonomousRunner error: {e}")
+        try:
+            while self.running:
+                self._wake.clear()  # Events arriving during the scan trigger another pass
+                # The three scans are independent, so run them concurrently
+                results = await asyncio.gather(
+                    self._check_for_new_jobs(),
+                    self._check_outbox(),       # Watch for Claude's reports
+                    self._check_blockers(),
+                    return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error(f"AutonomousRunner error: {result}")
+
+                # Poll fast while work is flowing, back off when idle: up to POLL_INTERVAL_MAX
+                # with a live watcher, POLL_INTERVAL_UNWATCHED when polling is all there is
+                if any(result is True for result in results):
+                    self.poll_interval = POLL_INTERVAL_MIN
+                else:
+                    ceiling = POLL_INTERVAL_MAX if self._watching else POLL_INTERVAL_UNWATCHED
+                    self.poll_interval = min(ceiling, self.poll_interval * 1.5)
+
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if stop_watcher:
+                stop_watcher()
+            self._watching = False
+            await self._drain_notifications(sender)
+
+    async def _drain_notifications(self, sender: asyncio.Task):
+        """Let the sender flush what is queued (e.g. a final "Job Complete") before stopping it."""
+        queue, self._tg_queue = self._tg_queue, None  # Anything notified from now on is sent directly
+        queue.put_nowait(None)  # Sentinel: the sender exits after sending everything ahead of it
+        try:
+            await asyncio.wait_for(sender, timeout=TELEGRAM_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Dropped {queue.qsize()} queued Telegram notifications on stop")
+        except Exception as e:
+            logger.error(f"Telegram sender failed while draining: {e}")
 
-            await asyncio.sleep(self.poll_interval)
+    async def _notify(self, user_id, message: str):
+        """
+        Queue a Telegram message. Used in place of telegram_callback here and by the
+        invokers, so bursts (e.g. many new reports) go out as a few combined sends.
+        """
+        if self._tg_queue is None:
+            await self.telegram_callback(user_id, message)
+        else:
+            self._tg_queue.put_nowait((user_id, message))
+
+    async def _telegram_sender(self):
+        """Drain the notification queue, coalescing each batch window per recipient.
+        A None on the queue stops it once everything queued before it is sent."""
+        queue = self._tg_queue
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is None:
+                return
+            batch = [item]
+            await asyncio.sleep(TELEGRAM_BATCH_WINDOW)
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is None:
+                    stopping = True
+                else:
+                    batch.append(item)
+
+            by_user = {}
+            for user_id, message in batch:
+                by_user.setdefault(user_id, []).append(message)
+
+            for user_id, messages in by_user.items():
+                for text, parts in self._pack_messages(messages):
+                    if await self._send(user_id, text) or len(parts) == 1:
+                        continue
+                    # One bad message (e.g. broken Markdown) sinks the whole pack; send them one by one
+                    for part in parts:
+                        await self._send(user_id, part)
+
+    async def _send(self, user_id, text: str) -> bool:
+        """Send one text; False if the callback raised or reported failure."""
+        try:
+            return await self.telegram_callback(user_id, text) is not False
+        except Exception as e:
+            logger.error(f"Telegram send failed: {e}")
+            return False
 
-    def stop(self):
-        """Stop the watcher loop."""
+    @staticmethod
+    def _pack_messages(messages: list) -> list:
+        """
+        Join messages with separators into as few texts as fit Telegram's size limit.
+        Returns (text, parts) pairs, parts being the messages joined into text; a message
+        longer than the limit is hard-split into pieces first.
+        """
+        sep = "\n\n---\n\n"
+        packed, current = [], []
+        size = 0
+        for message in messages:
+            for start in range(0, max(len(message), 1), TELEGRAM_MAX_CHARS):
+                piece = message[start:start + TELEGRAM_MAX_CHARS]
+                if current and size + len(sep) + len(piece) > TELEGRAM_MAX_CHARS:
+                    packed.append((sep.join(current), current))
+                    current, size = [], 0
+                size += len(piece) + (len(sep) if current else 0)
+                current.append(piece)
+        if current:
+            packed.append((sep.join(current), current))
+        return packed
+
+    def _start_watcher(self) -> Optional[Callable]:
+        """
+        Start a filesystem watcher on WATCHED_DIRS that wakes the main loop.
+        Returns a callable that stops it, or None when only polling is available.
+        """
+        if ASYNCINOTIFY_AVAILABLE:
+            return asyncio.create_task(self._inotify_pump()).cancel
+
+        if WATCHDOG_AVAILABLE:
+            loop = asyncio.get_running_loop()
+            handler = FileSystemEventHandler()
+            # Only finished writes matter: created fires on an empty file before any content, and
+            # opened/closed-without-write events from our own reads are ignored. Closed events are
+            # inotify-only, so other backends rely on modified.
+            handler.on_moved = handler.on_closed = handler.on_modified = \
+                lambda event: loop.call_soon_threadsafe(self._on_fs_event, event.src_path)
+            observer = Observer()
+            for d in WATCHED_DIRS:
+                observer.schedule(handler, d, recursive=False)
+            observer.daemon = True
+            observer.start()
+            self._watching = True
+            return observer.stop
+
+        logger.info(f"No filesystem watcher installed; polling every {self.poll_interval}s")
+        return None
+
+    async def _inotify_pump(self):
+        """Forward inotify close-after-write / moved-in events to the main loop."""
+        try:
+            with Inotify() as inotify:
+                for d in WATCHED_DIRS:
+                    inotify.add_watch(d, Mask.CLOSE_WRITE | Mask.MOVED_TO)
+                self._watching = True
+                async for event in inotify:
+                    self._on_fs_event(str(event.path))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning(f"inotify watcher stopped, falling back to polling: {e}")
+            if self._wake:
+                self._wake.set()  # Re-evaluate the poll interval without the watcher
+        finally:
+            self._watching = False
+
+    def _on_fs_event(self, path: str):
+        """Called on the event loop for every watched file arrival."""
+        name = os.path.basename(path)
+        if name.endswith("-answer.md"):
+            self._signal_answer(name[:-len("-answer.md")])
+        elif name.startswith("ANSWER-") and name.endswith(".md"):
+            # Script-mode answer file (ScriptInvoker naming)
+            self._signal_answer(name[len("ANSWER-"):-len(".md")])
+        if self._wake:
+            self._wake.set()
+
+    def _signal_answer(self, job_id: str):
+        """Wake an invoker waiting on this job's answer file."""
+        event = self._answer_events.get(job_id)
+        if event:
+            event.set()
+
+    async def stop(self):
+        """Stop the watcher loop, shut down running invokers and wait for their tasks."""
         self.running = False
+        if self._wake:
+            self._wake.set()  # Let the main loop exit without waiting out the poll interval
+        for job in self.active_jobs.values():
+            if job.invoker:
+                job.invoker.stop()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
         logger.info("AutonomousRunner stopped")
 
-    async def _check_for_new_jobs(self):
-        """Scan inbox for new PENDING jobs and start building them."""
-        if not os.path.exists(INBOX_DIR):
-            return
+    def _on_task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Job task failed: {task.exception()}")
 
-        for filename in os.listdir(INBOX_DIR):
-            # Accept both JOB-* (new format) and FOUNDER_JOB* (legacy)
-            if not (filename.startswith("JOB-") or filename.startswith("FOUNDER_JOB")):
-                continue
-            if not filename.endswith(".md"):
-                continue
+    async def _check_for_new_jobs(self) -> bool:
+        """Scan inbox for new PENDING jobs and start building them. True if any started."""
+        pending = await asyncio.to_thread(self._scan_inbox)
+        for job_id, filepath in pending:
+            # Start this job
+            logger.info(f"New job detected: {job_id}")
+            await self._start_job(job_id, filepath)
+        return bool(pending)
+
+    def _scan_inbox(self) -> list:
+        """Blocking inbox scan (run in a worker thread). Returns [(job_id, path)] of PENDING jobs."""
+        pending = []
+        if not self._dir_changed(INBOX_DIR):
+            return pending
+
+        with os.scandir(INBOX_DIR) as entries:
+            candidates = [e for e in entries
+                          if e.name.startswith(_JOB_PREFIXES) and e.name.endswith(".md") and e.is_file()]
+
+        for entry in candidates:
+            filename = entry.name
 
             job_id = filename.replace(".md", "")
 
@@ -120,53 +411,62 @@ class AutonomousRunner:
             if job_id in self.active_jobs:
                 continue
 
-            filepath = os.path.join(INBOX_DIR, filename)
-            with open(filepath, 'r') as f:
-                content = f.read()
+            filepath = entry.path
 
             # Only pick up PENDING jobs
-            if "STATUS**: PENDING" not in content and "STATUS: PENDING" not in content:
+            if not self._is_pending(filepath):
                 continue
 
-            # Start this job
-            logger.info(f"New job detected: {job_id}")
-            await self._start_job(job_id, filepath)
+            pending.append((job_id, filepath))
+        return pending
+
+    @staticmethod
+    def _is_pending(path: str) -> bool:
+        """Look for a PENDING status marker without reading/decoding the whole file."""
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False  # mmap can't map empty files (and they can't be PENDING)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm.find(b"STATUS**: PENDING") != -1 or mm.find(b"STATUS: PENDING") != -1
 
     async def _start_job(self, job_id: str, job_file: str):
         """Start building a job by invoking Claude Code."""
         # Update status to BUILDING
-        self._update_job_status(job_file, "BUILDING")
+        await asyncio.to_thread(self._update_job_status, job_file, "BUILDING")
 
         # Track it
-        self.active_jobs[job_id] = {
-            "status": "BUILDING",
-            "started": datetime.now().isoformat(),
-            "file": job_file
-        }
+        self.active_jobs[job_id] = JobEntry(
+            status="BUILDING",
+            started=datetime.now().isoformat(),
+            file=job_file
+        )
 
         # Create initial progress file
         progress_file = os.path.join(PROGRESS_DIR, f"{job_id}-progress.md")
-        with open(progress_file, 'w') as f:
-            f.write(f"# Progress: {job_id}\n\n")
-            f.write(f"**Started**: {datetime.now().isoformat()}\n")
-            f.write(f"**Status**: BUILDING\n\n")
-            f.write("## Phases\n\n")
-            f.write("- [ ] PRE-PRODUCTION (Planning)\n")
-            f.write("- [ ] PRODUCTION (Building)\n")
-            f.write("- [ ] POST-PRODUCTION (Testing)\n")
+        await asyncio.to_thread(Path(progress_file).write_text,
+            f"# Progress: {job_id}\n\n"
+            f"**Started**: {datetime.now().isoformat()}\n"
+            f"**Status**: BUILDING\n\n"
+            "## Phases\n\n"
+            "- [ ] PRE-PRODUCTION (Planning)\n"
+            "- [ ] PRODUCTION (Building)\n"
+            "- [ ] POST-PRODUCTION (Testing)\n"
+        )
 
         # Notify via Telegram
         mode_label = self.mode.value.capitalize()
         if self.telegram_callback:
-            await self.telegram_callback(
+            await self._notify(
                 None,  # Will need user_id from job file
                 f"🚀 **Job Started**: {job_id}\n\n"
                 f"Mode: {mode_label}\n"
                 f"Building autonomously. I'll report after each phase."
             )
 
-        # Invoke Claude Code using the selected mode
-        asyncio.create_task(self._invoke_by_mode(job_id, job_file))
+        # Invoke Claude Code using the selected mode (kept referenced until it finishes)
+        task = asyncio.create_task(self._invoke_by_mode(job_id, job_file))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
 
     async def _invoke_by_mode(self, job_id: str, job_file: str):
         """Invoke Claude using the appropriate mode."""
@@ -193,19 +493,22 @@ class AutonomousRunner:
                 constitution_dir=CONSTITUTION_DIR,
                 progress_dir=PROGRESS_DIR,
                 blockers_dir=BLOCKERS_DIR,
-                telegram_callback=self.telegram_callback
+                telegram_callback=self._notify if self.telegram_callback else None,
+                answer_event=self._answer_events.setdefault(job_id, asyncio.Event())
             )
 
-            self.active_jobs[job_id]["invoker"] = invoker
+            self.active_jobs[job_id].invoker = invoker
             await invoker.start()
 
             # Update status when done
-            self._update_job_status(job_file, "COMPLETE")
-            self.active_jobs[job_id]["status"] = "COMPLETE"
+            await asyncio.to_thread(self._update_job_status, job_file, "COMPLETE")
+            self.active_jobs[job_id].status = "COMPLETE"
 
         except Exception as e:
             logger.error(f"Interactive invoker failed: {e}")
-            self._update_job_status(job_file, "FAILED")
+            await asyncio.to_thread(self._update_job_status, job_file, "FAILED")
+        finally:
+            self._answer_events.pop(job_id, None)
 
     async def _invoke_script(self, job_id: str, job_file: str):
         """Use script generation mode."""
@@ -219,125 +522,171 @@ class AutonomousRunner:
                 progress_dir=PROGRESS_DIR,
                 blockers_dir=BLOCKERS_DIR,
                 outbox_dir=OUTBOX_DIR,
-                telegram_callback=self.telegram_callback
+                telegram_callback=self._notify if self.telegram_callback else None,
+                answer_event=self._answer_events.setdefault(job_id, asyncio.Event())
             )
 
-            self.active_jobs[job_id]["invoker"] = invoker
+            self.active_jobs[job_id].invoker = invoker
             await invoker.start()
 
             # Update status when done
-            self._update_job_status(job_file, "COMPLETE")
-            self.active_jobs[job_id]["status"] = "COMPLETE"
+            await asyncio.to_thread(self._update_job_status, job_file, "COMPLETE")
+            self.active_jobs[job_id].status = "COMPLETE"
 
         except Exception as e:
             logger.error(f"Script invoker failed: {e}")
-            self._update_job_status(job_file, "FAILED")
+            await asyncio.to_thread(self._update_job_status, job_file, "FAILED")
+        finally:
+            self._answer_events.pop(job_id, None)
 
     async def _invoke_simple(self, job_id: str, job_file: str):
         """Invoke Claude Code CLI to build the job (simple -p mode)."""
-        prompt = f"""You are the Omega Master Orchestrator.
-
-READ THESE FILES IN ORDER:
-1. {job_file}
-2. {CONSTITUTION_DIR}/CONSTITUTION/INSTRUCTOR.xml
-3. {CONSTITUTION_DIR}/USER SPACE/dev-work/hive/MASTER_ORCHESTRATOR.md
-
-EXECUTE:
-1. Claim this job (update STATUS to BUILDING if not already)
-2. Follow the Kit and Mode specified in the job
-3. After each major phase, write progress to: {PROGRESS_DIR}/{job_id}-progress.md
-4. If you need something from the user (API key, decision, clarification):
-   - Write a blocker file to: {BLOCKERS_DIR}/{job_id}-blocked.md
-   - Include: what you need, why, and what happens next
-   - STOP and wait (the bot will ask the user)
-5. When complete, update the job STATUS to COMPLETE
-
-Progress format:
-```
-## Phase X: [Name]
-**Status**: COMPLETE | IN_PROGRESS | BLOCKED
-**Summary**: What was done
-**Next**: What happens next
-```
-
-BEGIN NOW.
-"""
+        prompt = _SIMPLE_PROMPT_TMPL.format_map({
+            "job_file": job_file,
+            "job_id": job_id,
+            "constitution_dir": CONSTITUTION_DIR,
+            "progress_dir": PROGRESS_DIR,
+            "blockers_dir": BLOCKERS_DIR,
+        })
 
         try:
-            # Run Claude CLI with -p for non-interactive mode
+            # Run Claude CLI with -p for non-interactive mode; the prompt goes in on
+            # stdin (no argv length limit) and the loop keeps running meanwhile
             claude_path = os.path.expanduser("~/.local/bin/claude")
-            result = subprocess.run(
-                [claude_path, "-p", prompt],
-                capture_output=True,
-                text=True,
-                timeout=3600,  # 1 hour max
+            proc = await asyncio.create_subprocess_exec(
+                claude_path, "-p",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
                 cwd=CONSTITUTION_DIR
             )
+            try:
+                _, stderr = await asyncio.wait_for(
+                    proc.communicate(prompt.encode()),
+                    timeout=3600  # 1 hour max
+                )
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                logger.warning(f"Claude timed out for job: {job_id}")
+                return
 
-            if result.returncode == 0:
+            if proc.returncode == 0:
                 logger.info(f"Claude completed job: {job_id}")
-                self._update_job_status(
-                    self.active_jobs[job_id]["file"],
+                await asyncio.to_thread(
+                    self._update_job_status,
+                    self.active_jobs[job_id].file,
                     "COMPLETE"
                 )
-                self.active_jobs[job_id]["status"] = "COMPLETE"
+                self.active_jobs[job_id].status = "COMPLETE"
             else:
-                logger.error(f"Claude failed for {job_id}: {result.stderr}")
+                logger.error(f"Claude failed for {job_id}: {stderr.decode(errors='replace')}")
 
-        except subprocess.TimeoutExpired:
-            logger.warning(f"Claude timed out for job: {job_id}")
         except FileNotFoundError:
             logger.error("Claude CLI not found. Install claude-code or check PATH.")
         except Exception as e:
             logger.error(f"Failed to invoke Claude: {e}")
 
-    async def _check_outbox(self):
-        """Watch ai_outbox for new REPORT files from Claude and send to Telegram."""
-        if not os.path.exists(OUTBOX_DIR):
-            return
+    async def _check_outbox(self) -> bool:
+        """Watch ai_outbox for new REPORT files from Claude and send to Telegram. True if any sent or unsettled."""
+        reports, unsettled = await asyncio.to_thread(self._scan_outbox)
+        for key, filename, summary in reports:
+            # Send to Telegram
+            if self.telegram_callback:
+                await self._notify(
+                    None,
+                    f"📊 **Report**: {filename}\n\n{summary[:1000]}"
+                )
+                logger.info(f"Sent report to Telegram: {filename}")
 
-        for filename in os.listdir(OUTBOX_DIR):
-            # Look for REPORT-*.md files
-            if not filename.startswith("REPORT-") or not filename.endswith(".md"):
-                continue
+            # Mark as sent
+            self.sent_reports[key] = None
+        # Unsettled reports keep the poll interval short so they are picked up once written
+        return bool(reports) or unsettled
 
-            filepath = os.path.join(OUTBOX_DIR, filename)
+    def _scan_outbox(self) -> tuple:
+        """
+        Blocking outbox scan (run in a worker thread). Returns ([(inode key, name, summary)]
+        of unsent reports, whether any report was skipped as empty or still being written).
+        """
+        reports, unsettled = [], False
+        if not self._dir_changed(OUTBOX_DIR):
+            return reports, unsettled
+
+        with os.scandir(OUTBOX_DIR) as entries:
+            candidates = [e for e in entries
+                          if e.name.startswith("REPORT-") and e.name.endswith(".md") and e.is_file()]
+
+        present = set()
+        now_ns = time.time_ns()
+        for entry in candidates:
+            filename, filepath = entry.name, entry.path
+            st = entry.stat()
+            key = (st.st_dev, st.st_ino)
+            present.add(key)
 
             # Skip if already sent
-            if filepath in self.sent_reports:
+            if key in self.sent_reports:
                 continue
 
-            # Read report
+            # Empty or still being written: leave it unsent and force the next scan to look again
+            # (in-place writes don't touch the directory mtime _dir_changed caches)
+            if st.st_size == 0 or now_ns - st.st_mtime_ns <= _DIR_SETTLE_NS:
+                self._dir_state.pop(OUTBOX_DIR, None)
+                unsettled = True
+                continue
+
+            # Read only the head of the report — the summary never looks past it
             with open(filepath, 'r') as f:
-                content = f.read()
+                head = f.read(_REPORT_HEAD_CHARS)
 
             # Extract summary for Telegram (first 1000 chars or until ## Next)
-            summary = content[:1500]
+            summary = head
             if "## Next" in summary:
                 summary = summary.split("## Next")[0]
 
-            # Send to Telegram
+            reports.append((key, filename, summary))
+
+        # Bound the sent set: forget the oldest reports that have since left the outbox
+        # (entries for files still present are kept so they are never re-sent)
+        if len(self.sent_reports) > _SENT_REPORTS_MAX:
+            for stale in [k for k in self.sent_reports if k not in present]:
+                del self.sent_reports[stale]
+                if len(self.sent_reports) <= _SENT_REPORTS_MAX:
+                    break
+        return reports, unsettled
+
+    async def _check_blockers(self) -> bool:
+        """Check for blocker files and ask user for input. True if any were relayed."""
+        blockers = await asyncio.to_thread(self._scan_blockers)
+        for job_id, filepath, content in blockers:
+            # Notify user
             if self.telegram_callback:
-                await self.telegram_callback(
+                await self._notify(
                     None,
-                    f"📊 **Report**: {filename}\n\n{summary[:1000]}"
+                    f"⚠️ **Job Blocked**: {job_id}\n\n{content}\n\nReply with the requested information."
                 )
-                logger.info(f"Sent report to Telegram: {filename}")
 
-            # Mark as sent
-            self.sent_reports.add(filepath)
+            # Move to processed (so we don't spam)
+            self._seen_blockers.add(os.path.basename(filepath))
+            processed_path = filepath.replace("-blocked.md", "-blocked-sent.md")
+            await asyncio.to_thread(os.rename, filepath, processed_path)
+        return bool(blockers)
 
-    async def _check_blockers(self):
-        """Check for blocker files and ask user for input."""
-        if not os.path.exists(BLOCKERS_DIR):
-            return
+    def _scan_blockers(self) -> list:
+        """Blocking blockers scan (run in a worker thread). Returns [(job_id, path, content)]."""
+        blockers = []
+        if not self._dir_changed(BLOCKERS_DIR):
+            return blockers
 
-        for filename in os.listdir(BLOCKERS_DIR):
+        with os.scandir(BLOCKERS_DIR) as entries:
             # Support both BLOCKED-*.md (new) and *-blocked.md (legacy)
-            if not (filename.startswith("BLOCKED-") or filename.endswith("-blocked.md")):
-                continue
-            if not filename.endswith(".md"):
-                continue
+            candidates = [e for e in entries
+                          if (e.name.startswith("BLOCKED-") or e.name.endswith("-blocked.md"))
+                          and e.name.endswith(".md") and e.is_file()]
+
+        for entry in candidates:
+            filename = entry.name
 
             # Extract job_id
             if filename.startswith("BLOCKED-"):
@@ -345,48 +694,60 @@ BEGIN NOW.
             else:
                 job_id = filename.replace("-blocked.md", "")
 
-            filepath = os.path.join(BLOCKERS_DIR, filename)
+            # Skip if already relayed (BLOCKED-*.md keeps its name after "processing")
+            if filename in self._seen_blockers:
+                continue
+
+            filepath = entry.path
 
             # Read blocker
             with open(filepath, 'r') as f:
                 content = f.read()
 
-            # Notify user
-            if self.telegram_callback:
-                await self.telegram_callback(
-                    None,
-                    f"⚠️ **Job Blocked**: {job_id}\n\n{content}\n\nReply with the requested information."
-                )
+            blockers.append((job_id, filepath, content))
+        return blockers
 
-            # Move to processed (so we don't spam)
-            processed_path = filepath.replace("-blocked.md", "-blocked-sent.md")
-            os.rename(filepath, processed_path)
+    def _dir_changed(self, path: str) -> bool:
+        """
+        True if `path` may contain new entries since the last settled scan — one stat
+        instead of a listing plus a read per file when nothing has arrived.
+        """
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if self._dir_state.get(path) == mtime_ns:
+            return False
+        # Keep rescanning recently modified dirs until their files have had time to be written
+        if time.time_ns() - mtime_ns > _DIR_SETTLE_NS:
+            self._dir_state[path] = mtime_ns
+        return True
 
     def _update_job_status(self, job_file: str, status: str):
-        """Update the STATUS in a job file."""
-        with open(job_file, 'r') as f:
-            content = f.read()
-
-        content = content.replace("STATUS**: PENDING", f"STATUS**: {status}")
-        content = content.replace("STATUS: PENDING", f"STATUS: {status}")
-        content = content.replace("STATUS**: BUILDING", f"STATUS**: {status}")
-        content = content.replace("STATUS: BUILDING", f"STATUS: {status}")
-
-        with open(job_file, 'w') as f:
-            f.write(content)
+        """Update the STATUS in a job file (atomically, so scans never see a torn file)."""
+        content = _STATUS_RE.sub(lambda m: m.group(1) + status, Path(job_file).read_text())
+        # Sibling temp file ends in .tmp, so the inbox scan's *.md filter never picks it up
+        tmp = f"{job_file}.tmp"
+        Path(tmp).write_text(content)
+        os.replace(tmp, job_file)
 
     async def handle_user_response(self, job_id: str, response: str):
         """
         Handle user's response to a blocker.
-        Write to an answers file and resume Claude.
+        Hands it straight to the job's running invoker; without one, writes
+        it to the answers file for whoever picks the job up.
         """
+        job = self.active_jobs.get(job_id)
+        invoker = job.invoker if job else None
+        if invoker and hasattr(invoker, "send_input"):
+            await invoker.send_input(response)
+            logger.info(f"Routed user response to running invoker for {job_id}")
+            return
+
         answer_file = os.path.join(BLOCKERS_DIR, f"{job_id}-answer.md")
-        with open(answer_file, 'w') as f:
-            f.write(f"# User Response for {job_id}\n\n")
-            f.write(f"**Received**: {datetime.now().isoformat()}\n\n")
-            f.write(f"## Answer\n\n{response}\n")
-
-        # Resume Claude with the answer
-        if job_id in self.active_jobs:
-            job_file = self.active_jobs[job_id]["file"]
-            asyncio.create_task(self._invoke_claude(job_id, job_file))
+        await asyncio.to_thread(Path(answer_file).write_text,
+            f"# User Response for {job_id}\n\n"
+            f"**Received**: {datetime.now().isoformat()}\n\n"
+            f"## Answer\n\n{response}\n"
+        )
+        self._signal_answer(job_id)
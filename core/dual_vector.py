@@ -1,20 +1,85 @@
+import re
+import asyncio
 import logging
 import time
+from functools import lru_cache
+from typing import Callable, Optional
 from agents.terminal_agent import TerminalAgent
 from agents.phantom_agent import PhantomAgent
 
 logger = logging.getLogger(__name__)
 
+# Optional: pyahocorasick matches every routing keyword in one pass over the prompt
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Planning-type prompts go to Gemini 3.1 Pro (index 1), everything else to Claude Opus (index 4)
+PLANNER_MODEL_INDEX = 1
+BUILDER_MODEL_INDEX = 4
+# Whole words only, with the inflections worth routing: "spec" must not catch "specific"
+_PLAN_WORDS = (
+    "plan", "plans", "planned", "planning",
+    "blueprint", "blueprints",
+    "design", "designs", "designed", "designing",
+    "architect", "architects", "architected", "architecting",
+    "architecture", "architectures", "architectural",
+    "spec", "specs", "specification",
+)
+_ROUTE_KEYWORDS = dict.fromkeys(_PLAN_WORDS, PLANNER_MODEL_INDEX)
+# Fallback when pyahocorasick isn't installed
+_PLAN_RE = re.compile(r"\b(?:" + "|".join(_ROUTE_KEYWORDS) + r")\b", re.IGNORECASE)
+
+if AHOCORASICK_AVAILABLE:
+    _ROUTE_AC = ahocorasick.Automaton()
+    for _kw, _idx in _ROUTE_KEYWORDS.items():
+        _ROUTE_AC.add_word(_kw, (len(_kw), _idx))
+    _ROUTE_AC.make_automaton()
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+@lru_cache(maxsize=512)
+def _route_model(prompt: str) -> int:
+    """Pick the Antigravity model index for a task prompt (one pass, cached)."""
+    if not AHOCORASICK_AVAILABLE:
+        return PLANNER_MODEL_INDEX if _PLAN_RE.search(prompt) else BUILDER_MODEL_INDEX
+    text = prompt.lower()
+    last = len(text) - 1
+    for end, (length, model_index) in _ROUTE_AC.iter(text):
+        start = end - length + 1
+        # Same whole-word rule as the regex's \b on both sides
+        if (start == 0 or not _is_word_char(text[start - 1])) and \
+                (end == last or not _is_word_char(text[end + 1])):
+            return model_index
+    return BUILDER_MODEL_INDEX
+
+
 class DualVectorController:
     """
     Manages the lifecycle of both Vector 1 (Stealth/CLI) and Vector 2 (Phantom/GUI).
     Handles the handoff when one agent hits a rate limit.
     """
     
-    def __init__(self, workspace_root: str, autonomy_mode: str = "security"):
+    def __init__(self, workspace_root: str, autonomy_mode: str = "security", loop: asyncio.AbstractEventLoop = None,
+                 sender: Optional[Callable] = None):
         self.terminal = TerminalAgent(engine_cmd="claude", workspace_root=workspace_root, autonomy_mode=autonomy_mode)
         self.phantom = PhantomAgent(target_app_name="Antigravity")
         self.active_vector = 1  # 1 = Terminal, 2 = Phantom
+        # Bot loop for Telegram alerts raised from the (blocking) vision loop
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+        self._loop = loop
+        # async (user_id, message) used for alerts; resolved on first alert when not given,
+        # so importing this module doesn't pull in the Telegram bot
+        self._sender = sender
         
     def execute_task(self, prompt: str):
         """
@@ -64,12 +129,12 @@ class DualVectorController:
         
         # 2. Ultra-Optimized Model Routing
         # Use Gemini 3.1 Pro (Index 1) for Planning, Claude Opus (Index 4) for Complex Code
-        if "plan" in prompt.lower() or "blueprint" in prompt.lower() or "design" in prompt.lower():
+        model_index = _route_model(prompt)
+        if model_index == PLANNER_MODEL_INDEX:
             logger.info("[DualVector] Task Type: PLANNING -> Selecting Gemini 3.1 Pro")
-            self.phantom.switch_model(model_index=1)
         else:
             logger.info("[DualVector] Task Type: BUILDING -> Selecting Claude Opus")
-            self.phantom.switch_model(model_index=4)
+        self.phantom.switch_model(model_index=model_index)
             
         # 3. Inject Prompt
         # use_mouse=True for multi-monitor support
@@ -77,23 +142,27 @@ class DualVectorController:
         
         # 4. Watch screen for 'Accept All', 'Model Limits', and 'Crashes'
         # We wrap the Telegram alert in a lambda to handle async send
-        from core.telegram_bot import send_telegram_message
-        import asyncio
-
         def alert_mega_problem():
             msg = "⚠️ **MEGA PROBLEM DETECTED** in Antigravity!\n\nThe IDE has frozen (Spinning Wheel of Death). I clicked 'Keep Waiting' but you may need to remote in via Tailscale/Chrome Desktop."
             logger.critical(msg)
             # Fire and forget Telegram alert
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    loop.create_task(send_telegram_message(None, msg))
-            except:
-                pass
+            if self._loop is None or self._loop.is_closed():
+                logger.warning("[DualVector] No event loop captured; Telegram alert not sent.")
+                return
+            if self._sender is None:
+                from core.telegram_bot import send_telegram_message
+                self._sender = send_telegram_message
+            fut = asyncio.run_coroutine_threadsafe(self._sender(None, msg), self._loop)
+            fut.add_done_callback(
+                lambda f: f.cancelled() or f.exception() is None
+                or logger.error(f"[DualVector] Telegram alert failed: {f.exception()}")
+            )
 
+        # The loop already rotates the model on a limit frame; no extra "limit" handler needed
         self.phantom.vision_watch_loop(
-            on_limit=lambda: self.phantom._rotate_model(),
-            on_done=lambda: logger.info("[DualVector] Task Completed via Phantom."),
-            on_crash=alert_mega_problem,
+            handlers={
+                "done": lambda: logger.info("[DualVector] Task Completed via Phantom."),
+                "crash": alert_mega_problem,
+            },
             max_idle_seconds=600 # 10 minutes per user request
         )
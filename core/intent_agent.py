@@ -1,5 +1,13 @@
 # core/intent_agent.py — Omega Claw Intent Classifier
 import logging
+import re
+
+# Optional: pyahocorasick matches every registered keyword in one pass over the message
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 class IntentAgent:
     """
@@ -46,6 +54,7 @@ class IntentAgent:
                 "reasoning step", "external ai", "prompt ai"
             ],
         }
+        self._build_matcher()
         logging.info("IntentAgent initialized (Omega Claw)")
 
     def register_patterns(self, extra_patterns: dict):
@@ -53,11 +62,59 @@ class IntentAgent:
         for intent, keywords in extra_patterns.items():
             self.patterns[intent] = keywords
             logging.info(f"IntentAgent: Registered skill intent '{intent}' ({len(keywords)} keywords)")
+        self._build_matcher()
+
+    def _build_matcher(self):
+        """
+        Compile all keywords into one automaton. Each keyword maps to the earliest
+        (highest-priority) intent listing it, so dict order still decides ties.
+        Without pyahocorasick, build one alternation regex instead (see _build_regex).
+        """
+        self._automaton = None
+        self._regex = None
+        if not AHOCORASICK_AVAILABLE:
+            self._build_regex()
+            return
+        best = {}
+        for priority, (intent, keywords) in enumerate(self.patterns.items()):
+            for keyword in keywords:
+                best.setdefault(keyword, (priority, intent))
+        if not best:
+            return
+        automaton = ahocorasick.Automaton()
+        for keyword, ranked in best.items():
+            automaton.add_word(keyword, ranked)
+        automaton.make_automaton()
+        self._automaton = automaton
+
+    def _build_regex(self):
+        """
+        One named group per intent, in priority order, inside a lookahead so every
+        start offset is tried. At each offset the first group that matches is the
+        highest-priority intent with a keyword there; the minimum over all offsets
+        is the same answer the per-intent substring loop gives.
+        """
+        self._regex_intents = [intent for intent, keywords in self.patterns.items() if keywords]
+        if not self._regex_intents:
+            return
+        groups = "|".join(
+            f"(?P<i{idx}>" + "|".join(map(re.escape, self.patterns[intent])) + ")"
+            for idx, intent in enumerate(self._regex_intents)
+        )
+        self._regex = re.compile(f"(?=(?:{groups}))")
 
     def classify(self, user_text: str) -> str:
         text_lower = user_text.lower()
-        for intent, keywords in self.patterns.items():
-            if any(keyword in text_lower for keyword in keywords):
+        if self._automaton is not None:
+            hits = [ranked for _, ranked in self._automaton.iter(text_lower)]
+            if hits:
+                intent = min(hits)[1]
+                logging.info(f"IntentAgent: '{user_text}' -> {intent}")
+                return intent
+        elif self._regex is not None:
+            hits = [int(m.lastgroup[1:]) for m in self._regex.finditer(text_lower)]
+            if hits:
+                intent = self._regex_intents[min(hits)]
                 logging.info(f"IntentAgent: '{user_text}' -> {intent}")
                 return intent
         logging.info(f"IntentAgent: '{user_text}' -> chat (fallback)")
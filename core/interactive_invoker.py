@@ -8,6 +8,7 @@ Requires: pip install pexpect
 
 import os
 import re
+import codecs
 import asyncio
 import logging
 from pathlib import Path
@@ -24,6 +25,59 @@ except ImportError:
     PEXPECT_AVAILABLE = False
     logger.warning("pexpect not installed. Run: pip install pexpect")
 
+# Session sentinels, matched on raw PTY bytes (the session runs without a decoder).
+# Order matters: _monitor_session dispatches on the index; TIMEOUT/EOF are appended last.
+_MONITOR_PATTERNS = [re.compile(p) for p in (
+    rb'\[Y/n\]',           # Yes/No prompt (tool permission)
+    rb'\[y/N\]',           # Yes/No prompt (default no)
+    rb'Enter.*:',          # Input prompt
+    rb'BLOCKED:',          # Our blocker marker
+    rb'PHASE_COMPLETE:',   # Phase completion marker
+    rb'JOB_COMPLETE',      # Job done
+)]
+_READY_PATTERNS = [re.compile(p) for p in (
+    '(?:>|»)'.encode(),    # Common prompt characters
+    rb'How can I help',    # Initial greeting
+)]
+
+# Initial autonomous-session prompt; filled per job in _build_prompt
+_PROMPT_TMPL = """You are the Omega Master Orchestrator running in AUTONOMOUS mode.
+
+READ THESE FILES:
+1. {job_file}
+2. {constitution_dir}/CONSTITUTION/INSTRUCTOR.xml
+
+AUTONOMOUS PROTOCOL:
+1. Read and understand the job requirements
+2. Execute the build following the Kit specified
+3. After each major phase, output: PHASE_COMPLETE: [phase name]
+4. If you need user input (API key, decision), output: BLOCKED: [what you need]
+5. When completely done, output: JOB_COMPLETE
+6. Write your progress to: {progress_dir}/{job_id}-progress.md
+
+IMPORTANT:
+- You have FULL tool access (read, write, edit, bash)
+- Work autonomously - only ask the user when truly blocked
+- Report progress after each phase
+
+BEGIN NOW. Read the job file first."""
+
+# Progress lines worth surfacing in Telegram summaries (_summarize_output)
+_SUMMARY_KW_RE = re.compile(r'created|wrote|updated|complete|done|error|failed', re.IGNORECASE)
+_SUMMARY_TAIL_CHARS = 4096
+
+# Upper bound on how long _wait_for_answer trusts its answer_event before re-checking disk
+ANSWER_RECHECK_SECONDS = 60
+
+# Blocker text patterns, tried in order by _extract_needs
+_NEEDS_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'(need[s]?\s+(?:an?\s+)?(?:API|key|token|secret|password|credential)[^\n]+)',
+    r'(require[s]?\s+(?:an?\s+)?[^\n]+)',
+    r'(please\s+provide[^\n]+)',
+    r'(BLOCKED:\s*[^\n]+)',
+)]
+_ANSWER_RE = re.compile(r'## Answer\s*\n+(.+)', re.DOTALL)
+
 
 class InteractiveInvoker:
     """
@@ -38,7 +92,8 @@ class InteractiveInvoker:
         constitution_dir: str,
         progress_dir: str,
         blockers_dir: str,
-        telegram_callback: Optional[Callable] = None
+        telegram_callback: Optional[Callable] = None,
+        answer_event: Optional[asyncio.Event] = None
     ):
         self.job_id = job_id
         self.job_file = job_file
@@ -46,6 +101,8 @@ class InteractiveInvoker:
         self.progress_dir = progress_dir
         self.blockers_dir = blockers_dir
         self.telegram_callback = telegram_callback
+        self.answer_event = answer_event  # Set when {job_id}-answer.md is written
+        self._answer_delivered = False  # send_input() answered the current blocker
         self.child = None
         self.running = False
 
@@ -67,7 +124,6 @@ class InteractiveInvoker:
             # Spawn Claude in interactive mode
             self.child = pexpect.spawn(
                 claude_path,
-                encoding='utf-8',
                 timeout=300,  # 5 min timeout per interaction
                 cwd=self.constitution_dir,
                 env={**os.environ, 'TERM': 'dumb'}  # Simple terminal
@@ -95,15 +151,10 @@ class InteractiveInvoker:
     async def _wait_for_ready(self):
         """Wait for Claude to be ready to accept input."""
         # Claude Code shows ">" or similar when ready
-        patterns = [
-            r'[>»]',  # Common prompt characters
-            r'How can I help',  # Initial greeting
-            pexpect.TIMEOUT,
-            pexpect.EOF
-        ]
+        patterns = _READY_PATTERNS + [pexpect.TIMEOUT, pexpect.EOF]
 
         try:
-            index = self.child.expect(patterns, timeout=30)
+            index = await asyncio.to_thread(self.child.expect, patterns, timeout=30)
             if index == 2:  # TIMEOUT
                 logger.warning("Timeout waiting for Claude prompt")
             elif index == 3:  # EOF
@@ -111,28 +162,25 @@ class InteractiveInvoker:
         except Exception as e:
             logger.warning(f"Wait for ready: {e}")
 
+    # Indices into the expect() pattern list used by _expect_worker
+    _TIMEOUT_INDEX = 6
+    _EOF_INDEX = 7
+
     async def _monitor_session(self):
         """Monitor the Claude session for output, tool requests, blockers."""
         output_buffer = ""
         last_progress_update = datetime.now()
 
+        # pexpect blocks, so it is drained on a worker thread; matches arrive on a queue
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        loop.run_in_executor(None, self._expect_worker, events, loop)
+
         while self.running:
-            try:
-                # Read output (non-blocking via expect with short timeout)
-                patterns = [
-                    r'\[Y/n\]',           # Yes/No prompt (tool permission)
-                    r'\[y/N\]',           # Yes/No prompt (default no)
-                    r'Enter.*:',          # Input prompt
-                    r'BLOCKED:',          # Our blocker marker
-                    r'PHASE_COMPLETE:',   # Phase completion marker
-                    r'JOB_COMPLETE',      # Job done
-                    pexpect.TIMEOUT,
-                    pexpect.EOF
-                ]
-
-                index = self.child.expect(patterns, timeout=10)
-                output_buffer += self.child.before + self.child.after
+            index, chunk = await events.get()
+            output_buffer += chunk
 
+            try:
                 if index == 0 or index == 1:  # Tool permission request
                     # Auto-approve tool requests
                     logger.info(f"Auto-approving tool request for job {self.job_id}")
@@ -158,22 +206,40 @@ class InteractiveInvoker:
                     self.running = False
                     await self._finalize_job(output_buffer)
 
-                elif index == 6:  # TIMEOUT
+                elif index == self._TIMEOUT_INDEX:
                     # Check if we should send progress update
                     if (datetime.now() - last_progress_update).seconds > 60:
                         await self._report_progress(output_buffer, periodic=True)
                         last_progress_update = datetime.now()
 
-                elif index == 7:  # EOF
+                elif index == self._EOF_INDEX:
                     logger.info(f"Claude session ended for job {self.job_id}")
                     self.running = False
 
-            except pexpect.TIMEOUT:
-                # Normal - just loop again
-                await asyncio.sleep(1)
             except Exception as e:
                 logger.error(f"Monitor error: {e}")
-                await asyncio.sleep(5)
+
+    def _expect_worker(self, events: asyncio.Queue, loop: asyncio.AbstractEventLoop):
+        """
+        Runs in an executor thread: loops on child.expect() and posts (index, output)
+        to `events`. Always finishes by posting EOF so _monitor_session can't hang.
+        """
+        patterns = self.child.compile_pattern_list(_MONITOR_PATTERNS + [pexpect.TIMEOUT, pexpect.EOF])
+        # Incremental so a multi-byte character split across two reads still decodes
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        index = None
+        while self.running and index != self._EOF_INDEX:
+            try:
+                index = self.child.expect_list(patterns, timeout=10)
+                # On TIMEOUT/EOF, `after` is the exception class rather than bytes
+                after = self.child.after if isinstance(self.child.after, bytes) else b""
+                chunk = decoder.decode((self.child.before or b"") + after)
+            except Exception as e:
+                logger.error(f"Monitor error: {e}")
+                index, chunk = self._EOF_INDEX, ""
+            loop.call_soon_threadsafe(events.put_nowait, (index, chunk))
+        if index != self._EOF_INDEX:
+            loop.call_soon_threadsafe(events.put_nowait, (self._EOF_INDEX, ""))
 
     async def _handle_blocker(self, context: str):
         """Handle a blocker that needs user input."""
@@ -183,12 +249,13 @@ class InteractiveInvoker:
         # Extract what Claude needs
         needs = self._extract_needs(context)
 
-        with open(blocker_file, 'w') as f:
-            f.write(f"# Blocker: {self.job_id}\n\n")
-            f.write(f"**Time**: {datetime.now().isoformat()}\n\n")
-            f.write(f"## What's Needed\n\n{needs}\n\n")
-            f.write("## Context\n\n")
-            f.write(f"```\n{context[-500:]}\n```\n")
+        await asyncio.to_thread(Path(blocker_file).write_text,
+            f"# Blocker: {self.job_id}\n\n"
+            f"**Time**: {datetime.now().isoformat()}\n\n"
+            f"## What's Needed\n\n{needs}\n\n"
+            "## Context\n\n"
+            f"```\n{context[-500:]}\n```\n"
+        )
 
         # Notify via Telegram
         if self.telegram_callback:
@@ -203,36 +270,53 @@ class InteractiveInvoker:
     async def _wait_for_answer(self):
         """Wait for user to provide answer via answer file."""
         answer_file = os.path.join(self.blockers_dir, f"{self.job_id}-answer.md")
+        self._answer_delivered = False
 
         while self.running:
-            if os.path.exists(answer_file):
-                with open(answer_file, 'r') as f:
-                    content = f.read()
-
+            if self.answer_event:
+                self.answer_event.clear()  # Cleared before the check so a write in between isn't missed
+            if self._answer_delivered:
+                break
+            content = await asyncio.to_thread(self._consume_answer_file, answer_file)
+            if content is not None:
                 # Extract the answer
                 answer = self._extract_answer(content)
 
                 # Send to Claude
                 self.child.sendline(answer)
-
-                # Clean up
-                os.remove(answer_file)
                 logger.info(f"Sent user answer for job {self.job_id}")
                 break
 
-            await asyncio.sleep(5)
+            if self.answer_event:
+                # Woken as soon as the answer lands; the timeout is only a safety net
+                try:
+                    await asyncio.wait_for(self.answer_event.wait(), timeout=ANSWER_RECHECK_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(5)
+
+    @staticmethod
+    def _consume_answer_file(answer_file: str) -> Optional[str]:
+        """Read and delete the answer file; None if it hasn't been written yet."""
+        try:
+            with open(answer_file, 'r') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        os.remove(answer_file)
+        return content
 
     async def _report_progress(self, output: str, periodic: bool = False):
         """Write progress to file and notify Telegram."""
         progress_file = os.path.join(self.progress_dir, f"{self.job_id}-progress.md")
 
-        # Append to progress file
-        with open(progress_file, 'a') as f:
-            f.write(f"\n\n---\n**Update**: {datetime.now().isoformat()}\n")
-            if periodic:
-                f.write("(Periodic update - still working)\n")
-            # Include last 500 chars of output
-            f.write(f"\n```\n{output[-500:]}\n```\n")
+        # Append to progress file (last 500 chars of output)
+        entry = f"\n\n---\n**Update**: {datetime.now().isoformat()}\n"
+        if periodic:
+            entry += "(Periodic update - still working)\n"
+        entry += f"\n```\n{output[-500:]}\n```\n"
+        await asyncio.to_thread(self._append, progress_file, entry)
 
         # Notify Telegram (not for periodic updates to avoid spam)
         if self.telegram_callback and not periodic:
@@ -250,41 +334,25 @@ class InteractiveInvoker:
                 f"✅ **Job Complete**: {self.job_id}\n\nClaude has finished building."
             )
 
+    @staticmethod
+    def _append(path: str, text: str):
+        with open(path, 'a') as f:
+            f.write(text)
+
     def _build_prompt(self) -> str:
         """Build the initial prompt for Claude."""
-        return f"""You are the Omega Master Orchestrator running in AUTONOMOUS mode.
-
-READ THESE FILES:
-1. {self.job_file}
-2. {self.constitution_dir}/CONSTITUTION/INSTRUCTOR.xml
-
-AUTONOMOUS PROTOCOL:
-1. Read and understand the job requirements
-2. Execute the build following the Kit specified
-3. After each major phase, output: PHASE_COMPLETE: [phase name]
-4. If you need user input (API key, decision), output: BLOCKED: [what you need]
-5. When completely done, output: JOB_COMPLETE
-6. Write your progress to: {self.progress_dir}/{self.job_id}-progress.md
-
-IMPORTANT:
-- You have FULL tool access (read, write, edit, bash)
-- Work autonomously - only ask the user when truly blocked
-- Report progress after each phase
-
-BEGIN NOW. Read the job file first."""
+        return _PROMPT_TMPL.format_map({
+            "job_file": self.job_file,
+            "job_id": self.job_id,
+            "constitution_dir": self.constitution_dir,
+            "progress_dir": self.progress_dir,
+        })
 
     def _extract_needs(self, context: str) -> str:
         """Extract what Claude needs from the context."""
         # Look for common patterns
-        patterns = [
-            r'(need[s]?\s+(?:an?\s+)?(?:API|key|token|secret|password|credential)[^\n]+)',
-            r'(require[s]?\s+(?:an?\s+)?[^\n]+)',
-            r'(please\s+provide[^\n]+)',
-            r'(BLOCKED:\s*[^\n]+)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, context, re.IGNORECASE)
+        for pattern in _NEEDS_PATTERNS:
+            match = pattern.search(context)
             if match:
                 return match.group(1)
 
@@ -295,21 +363,16 @@ BEGIN NOW. Read the job file first."""
     def _extract_answer(self, content: str) -> str:
         """Extract the answer from answer file."""
         # Look for ## Answer section
-        match = re.search(r'## Answer\s*\n+(.+)', content, re.DOTALL)
+        match = _ANSWER_RE.search(content)
         if match:
             return match.group(1).strip()
         return content.strip()
 
     def _summarize_output(self, output: str) -> str:
         """Summarize output for Telegram notification."""
-        # Extract key points
-        lines = output.split('\n')
-        summary_lines = []
-
-        for line in lines[-20:]:  # Last 20 lines
-            line = line.strip()
-            if any(kw in line.lower() for kw in ['created', 'wrote', 'updated', 'complete', 'done', 'error', 'failed']):
-                summary_lines.append(f"• {line[:100]}")
+        # Extract key points from the last 20 lines (splitting only the tail of the buffer)
+        lines = output[-_SUMMARY_TAIL_CHARS:].split('\n')[-20:]
+        summary_lines = [f"• {line.strip()[:100]}" for line in lines if _SUMMARY_KW_RE.search(line)]
 
         if summary_lines:
             return '\n'.join(summary_lines[:5])  # Max 5 points
@@ -325,3 +388,7 @@ BEGIN NOW. Read the job file first."""
         """Send input to the running Claude session."""
         if self.child and self.running:
             self.child.sendline(text)
+            # Also releases a pending _wait_for_answer
+            self._answer_delivered = True
+            if self.answer_event:
+                self.answer_event.set()
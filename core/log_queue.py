@@ -0,0 +1,86 @@
+# core/log_queue.py — Omega Claw Write-Behind Command Log
+"""
+Keeps command_log inserts off the request path.
+
+Handlers call enqueue_command(); a background task drains the queue and writes
+up to LOG_BATCH_MAX rows per SQLite transaction (executemany in a worker thread).
+Until the worker is running (install scripts, one-off CLI use), writes stay synchronous.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from db.database import log_command, log_commands
+
+logger = logging.getLogger(__name__)
+
+# Max rows per transaction, and how long to wait for more rows after the first one
+LOG_BATCH_MAX = 64
+LOG_BATCH_WINDOW = 0.2
+
+LOG_Q: asyncio.Queue = asyncio.Queue()
+_worker: Optional[asyncio.Task] = None
+
+
+def enqueue_command(user_id: int, message: str, intent: str, response: str):
+    """Queue a command_log row (falls back to a direct write if no worker is running)."""
+    if _worker is None or _worker.done():
+        log_command(user_id, message, intent, response)
+        return
+    LOG_Q.put_nowait((user_id, message, intent, response))
+
+
+def start_flush_worker() -> asyncio.Task:
+    """Start the background flusher on the running loop (idempotent)."""
+    global _worker
+    if _worker is None or _worker.done():
+        _worker = asyncio.create_task(flush_worker())
+    return _worker
+
+
+async def stop_flush_worker():
+    """Cancel the flusher and wait for its final flush of still-queued rows (bot shutdown)."""
+    global _worker
+    worker, _worker = _worker, None  # Later enqueue_command calls write directly
+    if worker is None or worker.done():
+        return
+    worker.cancel()
+    try:
+        await worker
+    except asyncio.CancelledError:
+        pass
+
+
+async def flush_worker():
+    """Drain LOG_Q in batches of up to LOG_BATCH_MAX rows or LOG_BATCH_WINDOW seconds."""
+    loop = asyncio.get_running_loop()
+    batch = []
+    try:
+        while True:
+            batch.append(await LOG_Q.get())
+            deadline = loop.time() + LOG_BATCH_WINDOW
+            while len(batch) < LOG_BATCH_MAX:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(LOG_Q.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Hand the rows off before awaiting: if cancelled mid-write, the worker thread still
+            # finishes this batch and the shutdown flush below must not write it a second time
+            rows, batch = batch, []
+            try:
+                await asyncio.to_thread(log_commands, rows)
+            except Exception as e:
+                logger.error(f"Command log flush failed ({len(rows)} rows dropped): {e}")
+    finally:
+        # Shutdown: write whatever is still pending before the loop goes away
+        while not LOG_Q.empty():
+            batch.append(LOG_Q.get_nowait())
+        if batch:
+            try:
+                log_commands(batch)
+            except Exception as e:
+                logger.error(f"Command log flush failed ({len(batch)} rows dropped): {e}")
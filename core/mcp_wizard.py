@@ -2,10 +2,38 @@
 import json
 import os
 import re
+from dataclasses import dataclass, field
 from db.database import set_wizard_state, clear_wizard_state
 
-# The blueprint for each MCP's wizard requirements
-MCP_BLUEPRINTS = {
+
+# Appended to every wizard question
+_CANCEL_HINT = "\n\n_Type `cancel` to abort._"
+
+
+@dataclass(frozen=True, slots=True)
+class Question:
+    key: str
+    prompt: str
+    full_prompt: str = field(init=False)  # prompt + cancel hint, rendered once
+
+    def __post_init__(self):
+        object.__setattr__(self, "full_prompt", self.prompt + _CANCEL_HINT)
+
+
+@dataclass(frozen=True, slots=True)
+class Blueprint:
+    name: str
+    questions: tuple  # Tuple[Question, ...]
+    template_str: str  # format_map-ready JSON config
+
+
+# Where finished wizards write their MCP config and .env fallback (resolved once)
+_CONFIG_DIR = os.path.expanduser("~/Documents/omega-claw/mcps")
+_ENV_PATH = os.path.expanduser("~/Documents/omega-claw/.env")
+_dir_ready = False
+
+# The blueprint for each MCP's wizard requirements (source form; see MCP_BLUEPRINTS below)
+_BLUEPRINT_SPECS = {
     "supabase": {
         "name": "Supabase PostgreSQL",
         "questions": [
@@ -51,7 +79,32 @@ MCP_BLUEPRINTS = {
     }
 }
 
+class _SafeDict(dict):
+    """format_map mapping that leaves unanswered placeholders as `{KEY}`."""
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+def _format_template(spec: dict) -> str:
+    """Serialize a blueprint template as a str.format string: JSON braces doubled, {KEY} kept."""
+    template_str = json.dumps(spec["template"], indent=2).replace("{", "{{").replace("}", "}}")
+    for q in spec["questions"]:
+        template_str = template_str.replace("{{" + q["key"] + "}}", "{" + q["key"] + "}")
+    return template_str
+
+
+# Frozen, slotted blueprints with their templates pre-rendered, built once at import
+MCP_BLUEPRINTS = {
+    mcp_id: Blueprint(
+        name=spec["name"],
+        questions=tuple(Question(**q) for q in spec["questions"]),
+        template_str=_format_template(spec),
+    )
+    for mcp_id, spec in _BLUEPRINT_SPECS.items()
+}
+
 def handle_wizard_input(user_id: int, user_text: str, state: dict) -> str:
+    global _dir_ready
     # Check for cancel
     if user_text.lower().strip() in ["cancel", "stop", "abort"]:
         clear_wizard_state(user_id)
@@ -66,12 +119,12 @@ def handle_wizard_input(user_id: int, user_text: str, state: dict) -> str:
         clear_wizard_state(user_id)
         return "❌ Error: Invalid MCP blueprint requested. Wizard closed."
 
-    questions = blueprint["questions"]
+    questions = blueprint.questions
 
     # Save the answer for the PREVIOUS question we just asked
     if step > 0:
         prev_q = questions[step - 1]
-        answers[prev_q["key"]] = user_text.strip()
+        answers[prev_q.key] = user_text.strip()
     
     # Are there more questions?
     if step < len(questions):
@@ -80,34 +133,35 @@ def handle_wizard_input(user_id: int, user_text: str, state: dict) -> str:
         state["step"] = step + 1
         state["answers"] = answers
         set_wizard_state(user_id, state)
-        return next_q["prompt"] + "\n\n_Type `cancel` to abort._"
+        return next_q.full_prompt
 
     # All questions answered! Generate the config.
-    config_dir = os.path.expanduser("~/Documents/omega-claw/mcps")
-    os.makedirs(config_dir, exist_ok=True)
+    if not _dir_ready:
+        os.makedirs(_CONFIG_DIR, exist_ok=True)
+        _dir_ready = True
     
-    config_path = os.path.join(config_dir, f"{mcp_id}-mcp.json")
+    config_path = os.path.join(_CONFIG_DIR, f"{mcp_id}-mcp.json")
     
-    # Render template
-    template_str = json.dumps(blueprint["template"], indent=2)
-    for k, v in answers.items():
-        template_str = template_str.replace(f"{{{k}}}", v)
+    # Render template in a single C-level format pass over the pre-serialized JSON
+    template_str = blueprint.template_str.format_map(_SafeDict(answers))
         
     with open(config_path, "w") as f:
         f.write(template_str)
 
     # Append the environment variables directly to .env for fallback compatibility
-    env_path = os.path.expanduser("~/Documents/omega-claw/.env")
+    payload = f"\n# Auto-configured by {mcp_id} MCP wizard\n" + "".join(f"{k}='{v}'\n" for k, v in answers.items())
     try:
-        with open(env_path, "a") as f:
-            f.write(f"\n# Auto-configured by {mcp_id} MCP wizard\n")
-            for k, v in answers.items():
-                f.write(f"{k}='{v}'\n")
+        # One O_APPEND write; a newly created .env is owner-only since it holds secrets
+        fd = os.open(_ENV_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, payload.encode("utf-8"))
+        finally:
+            os.close(fd)
     except Exception as e:
         pass
         
     clear_wizard_state(user_id)
     
-    return f"✅ **{blueprint['name']} MCP configured successfully!**\n\n" \
+    return f"✅ **{blueprint.name} MCP configured successfully!**\n\n" \
            f"The JSON config has been created and context loaded into Omega Claw.\n" \
            f"Future jobs assigned to Claude Code will now inherit this MCP."
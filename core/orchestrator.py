@@ -4,13 +4,61 @@ Routes Telegram messages directly to Claude Code via terminal bridge.
 No more dumb keyword matching - real AI understanding.
 """
 
+import asyncio
+import functools
 import logging
 import os
-from db.database import log_command
+import time
+from concurrent.futures import ThreadPoolExecutor
+from core.log_queue import enqueue_command
+from db.database import get_autonomy_mode
 
 # Check which mode we're in
 BRIDGE_MODE = os.getenv("OMEGA_BRIDGE_MODE", "true").lower() == "true"
 
+# Vector success replies; the stealth one is pre-rendered for each autonomy mode
+_STEALTH_OK = (
+    "🥷 **Vector 1 (Stealth Engine) Engaged**\n\n"
+    "Prompt injected into invisible terminal running `claude`.\n"
+    "Autonomy Mode: `{}`"
+)
+_STEALTH_REPLIES = {mode: _STEALTH_OK.format(mode.upper()) for mode in ("full", "security", "manual")}
+_PHANTOM_OK = (
+    "👻 **Vector 2 (Phantom Engine) Engaged**\n\n"
+    "Antigravity desktop app successfully focused.\n"
+    "Prompt physically typed and executed via `pyautogui`."
+)
+
+# Frame differencing while an external AI renders its answer (/prompt bridge)
+_AI_WAIT_SECONDS = 15
+_AI_POLL_SECONDS = 0.5
+_AI_STABLE_FRAMES = 3
+_AI_STABLE_DELTA = 64 * 64 * 2  # Summed thumbnail change; ~2 grey levels per pixel
+
+
+async def _await_ai_done(agent, gui, timeout: float = _AI_WAIT_SECONDS) -> bool:
+    """
+    Wait until the screen has changed (the external AI started answering) and then
+    held still for _AI_STABLE_FRAMES polls. Returns False if that doesn't happen
+    within `timeout`. Sleeps with asyncio so other users keep being served.
+    `gui` runs a screen call on the orchestrator's GUI thread.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    prev = await gui(agent.frame_thumbnail)
+    started, stable = False, 0
+    while loop.time() < deadline:
+        await asyncio.sleep(_AI_POLL_SECONDS)
+        cur = await gui(agent.frame_thumbnail)
+        if agent.frame_delta(prev, cur) < _AI_STABLE_DELTA:
+            stable += 1
+            if started and stable >= _AI_STABLE_FRAMES:
+                return True
+        else:
+            started, stable = True, 0
+        prev = cur
+    return False
+
 
 class Orchestrator:
     """
@@ -24,6 +72,10 @@ class Orchestrator:
     def __init__(self):
         self.bridge = None
         self.bridge_ready = False
+        self._phantom = None  # PhantomAgent, created on first Vector 2 use
+        self._terminals = {}  # (user_id, autonomy_mode) -> TerminalAgent
+        # PyAutoGUI and the mss capture handle aren't thread-safe: one thread owns all GUI work
+        self._gui_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="omega-gui")
 
         if BRIDGE_MODE:
             logging.info("Orchestrator: Bridge mode enabled - messages go to Claude")
@@ -31,6 +83,29 @@ class Orchestrator:
             logging.info("Orchestrator: Legacy mode - keyword matching")
             self._init_legacy()
 
+    async def _gui(self, fn, *args, **kwargs):
+        """Run a blocking PyAutoGUI/screen call on the GUI thread without stalling the loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._gui_executor, functools.partial(fn, *args, **kwargs))
+
+    def _phantom_agent(self):
+        """Shared PhantomAgent: its landmarks, screen handles and OCR pool are set up once."""
+        if self._phantom is None:
+            # Imported once, on first use: the GUI stack (pyautogui, PIL) is optional
+            from agents.phantom_agent import PhantomAgent
+            self._phantom = PhantomAgent()
+        return self._phantom
+
+    def _terminal_agent(self, user_id: int, mode: str):
+        """Per-user TerminalAgent, replaced once its CLI child has exited."""
+        key = (user_id, mode)
+        agent = self._terminals.get(key)
+        if agent is None or (agent.child is not None and not agent.child.isalive()):
+            # Imported only when an agent is built: pexpect is an optional dependency
+            from agents.terminal_agent import TerminalAgent
+            agent = self._terminals[key] = TerminalAgent(autonomy_mode=mode)
+        return agent
+
     def _init_legacy(self):
         """Initialize legacy keyword matching (fallback)."""
         from core.intent_agent import IntentAgent
@@ -40,8 +115,8 @@ class Orchestrator:
         self.agent_registry = AgentRegistry()
 
         try:
-            from core.skill_loader import SkillLoader
-            loader = SkillLoader()
+            from core.skill_loader import get_skill_loader
+            loader = get_skill_loader()
             if loader.get_loaded_count() > 0:
                 self.intent_agent.register_patterns(loader.get_intent_patterns())
         except Exception as e:
@@ -68,22 +143,15 @@ class Orchestrator:
     async def handle_message(self, user_id: int, user_text: str) -> str:
         """Route message to Claude or fallback to legacy."""
         
-        # Dual-Vector Routing
-        if user_text.strip().lower().startswith("/phantom"):
-            # Strip command and send to Vector 2 (GUI Automation)
-            intent_text = user_text[len("/phantom"):].strip()
-            return await self._handle_vector2_phantom(user_id, intent_text)
-            
-        elif user_text.strip().lower().startswith("/stealth"):
-            # Strip command and send to Vector 1 (Terminal Pexpect)
-            intent_text = user_text[len("/stealth"):].strip()
-            return await self._handle_vector1_stealth(user_id, intent_text)
-
-        elif user_text.strip().lower().startswith("/prompt"):
-            # Phase 4: AI-to-AI Bridge
-            # Syntax: /prompt NotebookLM "How do I build a SaaS?"
-            intent_text = user_text[len("/prompt"):].strip()
-            return await self._handle_vector2_prompt(user_id, intent_text)
+        # Dual-Vector Routing: /phantom (Vector 2 GUI), /stealth (Vector 1 terminal),
+        # /prompt (Phase 4 AI-to-AI bridge, e.g. /prompt NotebookLM "How do I build a SaaS?")
+        text = user_text.lstrip()
+        if text[:1] == "/":
+            parts = text.split(None, 1)
+            handler = self._DISPATCH.get(parts[0].lower())
+            if handler:
+                intent_text = parts[1].strip() if len(parts) > 1 else ""
+                return await handler(self, user_id, intent_text)
 
         # Try legacy mode (intent agent -> founder jobs)
         return await self._handle_legacy(user_id, user_text)
@@ -91,8 +159,7 @@ class Orchestrator:
     async def _handle_vector2_prompt(self, user_id: int, user_text: str) -> str:
         """[Phase 4] The AI-to-AI Bridge. Prompts one AI, extracts output, injects into another."""
         try:
-            from agents.phantom_agent import PhantomAgent
-            agent = PhantomAgent()
+            agent = self._phantom_agent()
             
             # 1. Prompt External AI (NotebookLM/Gemini)
             # Simple parse: ToolName "Instruction"
@@ -100,23 +167,23 @@ class Orchestrator:
             tool = parts[0] if len(parts) > 0 else "Gemini"
             instruction = parts[1] if len(parts) > 1 else user_text
             
-            agent.prompt_external_ai(tool, instruction)
+            await self._gui(agent.prompt_external_ai, tool, instruction)
             
-            # 2. Wait for AI to 'Reason' (placeholder sleep or vision loop)
-            # Future: Use vision_watch_loop to detect 'Done' on the browser
-            time.sleep(15) 
+            # 2. Wait for AI to 'Reason': until its output stops changing on screen
+            if not await _await_ai_done(agent, self._gui):
+                logging.info("Orchestrator: external AI still rendering after wait, extracting anyway")
             
             # 3. Extract Artifact
-            artifact = agent.extract_ai_artifact()
+            artifact = await self._gui(agent.extract_ai_artifact)
             if not artifact:
                 return "❌ AI-to-AI Bridge: Failed to extract artifact from external AI."
 
             # 4. Inject into Antigravity
             injection_prompt = f"Using the reasoning from {tool}, please implement the following:\n\n{artifact}"
-            agent.force_focus() # Back to IDE
-            agent.inject_prompt(injection_prompt, use_mouse=True)
+            await self._gui(agent.force_focus) # Back to IDE
+            await self._gui(agent.inject_prompt, injection_prompt, use_mouse=True)
             
-            log_command(user_id, f"/prompt {user_text}", "phantom:prompt", f"Bridge successful: {tool} -> Antigravity")
+            enqueue_command(user_id, f"/prompt {user_text}", "phantom:prompt", f"Bridge successful: {tool} -> Antigravity")
             return f"🌩️ **Phase 4: AI-to-AI Bridge Successful**\n\nPrompted: `{tool}`\nExtracted Reasoning: `{len(artifact)} chars`\nInjected into: `Antigravity`"
             
         except Exception as e:
@@ -124,36 +191,39 @@ class Orchestrator:
 
     async def _handle_vector1_stealth(self, user_id: int, user_text: str) -> str:
         """[Vector 1] Send message directly to invisible local CLI."""
-        from agents.terminal_agent import TerminalAgent
-        from db.database import get_autonomy_mode
-        
         mode = get_autonomy_mode(user_id)
-        agent = TerminalAgent(autonomy_mode=mode)
+        agent = self._terminal_agent(user_id, mode)
         
         try:
-            agent.send_intent(user_text)
+            # Spawning the CLI and writing to its PTY block: keep them off the loop
+            await asyncio.to_thread(agent.send_intent, user_text)
             # Log it
-            log_command(user_id, f"/stealth {user_text}", "vector1:stealth", "Stealth engine spawned.")
-            return f"🥷 **Vector 1 (Stealth Engine) Engaged**\n\nPrompt injected into invisible terminal running `claude`.\nAutonomy Mode: `{mode.upper()}`"
+            enqueue_command(user_id, f"/stealth {user_text}", "vector1:stealth", "Stealth engine spawned.")
+            return _STEALTH_REPLIES.get(mode) or _STEALTH_OK.format(mode.upper())
         except Exception as e:
             return f"❌ Failed to launch Vector 1: {e}"
 
     async def _handle_vector2_phantom(self, user_id: int, user_text: str) -> str:
         """[Vector 2] Send message to GUI Automation wrapper to take over the Mac."""
         try:
-            from agents.phantom_agent import PhantomAgent
-            agent = PhantomAgent()
-            # The inject prompt holds the thread while PyAutoGui types
-            agent.inject_prompt(user_text)
+            agent = self._phantom_agent()
+            # The inject prompt holds the GUI thread while PyAutoGui types
+            await self._gui(agent.inject_prompt, user_text)
             
-            log_command(user_id, f"/phantom {user_text}", "vector2:phantom", "Phantom engine spawned.")
-            return f"👻 **Vector 2 (Phantom Engine) Engaged**\n\nAntigravity desktop app successfully focused.\nPrompt physically typed and executed via `pyautogui`."
+            enqueue_command(user_id, f"/phantom {user_text}", "vector2:phantom", "Phantom engine spawned.")
+            return _PHANTOM_OK
         except Exception as e:
             return f"❌ Failed to launch Vector 2: {e}\nAre the robotic dependencies installed?"
 
+    # Slash command -> handler, looked up on the lowercased first token
+    _DISPATCH = {
+        "/phantom": _handle_vector2_phantom,
+        "/stealth": _handle_vector1_stealth,
+        "/prompt": _handle_vector2_prompt,
+    }
+
     async def _handle_legacy(self, user_id: int, user_text: str) -> str:
         """Legacy keyword-based routing."""
-        import time
         start = time.time()
 
         intent = self.intent_agent.classify(user_text)
@@ -167,20 +237,20 @@ class Orchestrator:
                 "• `job history` — View past builds\n"
                 "• `inbox` — Check pending Founder Jobs"
             )
-            log_command(user_id, user_text, "chat", response)
+            enqueue_command(user_id, user_text, "chat", response)
             return response
 
         agent, routed_intent = self.agent_registry.route_intent(intent)
 
         if not agent:
             response = f"❌ No agent for intent: `{intent}`"
-            log_command(user_id, user_text, intent, response)
+            enqueue_command(user_id, user_text, intent, response)
             return response
 
         response = agent.execute(routed_intent, user_text=user_text, user_id=user_id)
 
         elapsed = int((time.time() - start) * 1000)
         logging.info(f"Orchestrator: {intent} -> {agent.name} ({elapsed}ms)")
-        log_command(user_id, user_text, intent, response[:500])
+        enqueue_command(user_id, user_text, intent, response[:500])
 
         return response
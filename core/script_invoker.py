@@ -10,16 +10,101 @@ Cons: Limited to what scripts can do
 import os
 import re
 import json
-import subprocess
 import asyncio
 import logging
 import tempfile
+from collections import deque
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Callable, List, Dict
+from typing import Optional, Callable, Deque, Dict
 
 logger = logging.getLogger(__name__)
 
+# Claude Code CLI; every cycle is a fresh, stateless `claude -p` run
+_CLAUDE_PATH = os.path.expanduser("~/.local/bin/claude")
+
+# Retry delay after a cycle raises: doubles per consecutive failure up to the cap; give up after the streak limit
+_RETRY_BACKOFF_START = 1
+_RETRY_BACKOFF_MAX = 60
+_RETRY_FAIL_LIMIT = 10
+
+# Execution-log entries kept in memory; the full log is streamed to {job_id}-execution-log.jsonl
+_EXEC_LOG_RECENT = 200
+
+# Longest Claude reply parsed per cycle, and longest fence body one match may span; the caps
+# bound the regex work per opening fence when a reply has unterminated or runaway fences
+_RESPONSE_MAX = 200_000
+_FENCE_BODY_MAX = 65_536
+
+# Action fences Claude answers each cycle with (see _build_cycle_prompt), as one
+# alternation so a single scan finds them all; named groups say which one matched.
+# Closing fences are lookaheads so they can still open the next fence, as with separate searches
+_ACTION_RE = re.compile(
+    r'```(?:'
+    r'(?P<complete>complete)\s*\n?(?P<complete_body>.{0,%(body)d}?)(?=```)'
+    r'|(?P<blocked>blocked)\s*\n?(?P<blocked_body>.{0,%(body)d}?)(?=```)'
+    r'|phase:(?P<phase>\w{1,64})'
+    r'|bash\s*\n(?P<bash>.{0,%(body)d}?)(?=```)'
+    r'|write:(?P<write_path>[^\n]{1,1024})\n(?P<write_body>.{0,%(file)d}?)(?=```)'
+    r')' % {"body": _FENCE_BODY_MAX, "file": _RESPONSE_MAX},
+    re.DOTALL,
+)
+# When several fences appear, the earlier kind here wins (not the earlier position)
+_ACTION_PRIORITY = ("complete", "blocked", "phase", "bash", "write_path")
+# Body of an ANSWER-<job>.md file
+_ANSWER_RE = re.compile(r'## Answer\s*\n+(.+)', re.DOTALL)
+
+
+def _write_text(path: str, text: str, mode: str = 'w'):
+    """Blocking write; callers run it via asyncio.to_thread so the loop keeps serving."""
+    with open(path, mode) as f:
+        f.write(text)
+
+
+# Per-cycle part of the build prompt; the job header before it is built once in start()
+_CYCLE_PROMPT_TAIL = """## Current Phase: {phase}
+
+## Completed Actions (recent)
+{completed}
+
+## Last Result
+{last}
+
+## Your Task
+Determine the NEXT action needed. Respond with ONE of these formats:
+
+### To execute a bash command:
+```bash
+<your command here>
+```
+
+### To create/write a file:
+```write:path/to/file.ext
+<file content>
+```
+
+### To indicate you need user input:
+```blocked
+REASON: <what you need from the user>
+```
+
+### To indicate the job is complete:
+```complete
+SUMMARY: <what was built>
+```
+
+### To indicate the next phase:
+```phase:<phase_name>
+```
+
+IMPORTANT:
+- Output ONLY ONE action per response
+- Prefer simple, atomic commands
+- Check results before proceeding
+- If stuck, request user input via blocked
+
+What's the next action?"""
+
 
 class ScriptInvoker:
     """
@@ -36,7 +121,8 @@ class ScriptInvoker:
         blockers_dir: str,
         outbox_dir: str = None,
         telegram_callback: Optional[Callable] = None,
-        max_cycles: int = 50  # Safety limit
+        max_cycles: int = 50,  # Safety limit
+        answer_event: Optional[asyncio.Event] = None
     ):
         self.job_id = job_id
         self.job_file = job_file
@@ -49,7 +135,13 @@ class ScriptInvoker:
         self.max_cycles = max_cycles
         self.running = False
         self.cycle_count = 0
-        self.execution_log: List[Dict] = []
+        self.execution_log: Deque[Dict] = deque(maxlen=_EXEC_LOG_RECENT)
+        self._log_path = os.path.join(progress_dir, f"{job_id}-execution-log.jsonl")
+        self._log_fp = None  # Open for the duration of start()
+        self._prompt_head = ""  # Job header of the cycle prompt, built in start()
+        self._answer: Optional[str] = None  # Set by send_input() while blocked
+        # Set by send_input() or, when the runner shares one, by its watcher on ANSWER-{job_id}.md
+        self._answer_ready = answer_event or asyncio.Event()
 
     async def start(self) -> bool:
         """Start the script-based build cycle."""
@@ -57,14 +149,18 @@ class ScriptInvoker:
         logger.info(f"ScriptInvoker starting for job {self.job_id}")
 
         # Read the job file
-        with open(self.job_file, 'r') as f:
-            job_content = f.read()
+        job_content = await asyncio.to_thread(Path(self.job_file).read_text)
+        # The job never changes during a build: build the prompt's header once
+        self._prompt_head = (
+            f"You are the Omega Build Agent working on job: {self.job_id}\n\n"
+            f"## Job Description\n{job_content[:2000]}\n\n"
+        )
 
         # Initialize context
         context = {
             "job": job_content,
             "phase": "init",
-            "completed_actions": [],
+            "completed_actions": deque(maxlen=10),  # Only the 10 most recent are ever shown
             "last_result": None
         }
 
@@ -75,39 +171,58 @@ class ScriptInvoker:
                 f"🚀 **Job Started (Script Mode)**: {self.job_id}\n\nBuilding in cycles. Will report progress."
             )
 
-        # Main build loop
-        while self.running and self.cycle_count < self.max_cycles:
-            try:
-                result = await self._run_cycle(context)
-
-                if result["status"] == "complete":
-                    logger.info(f"Job {self.job_id} completed")
-                    await self._finalize_job()
-                    break
-
-                elif result["status"] == "blocked":
-                    await self._handle_blocker(result["reason"])
-                    # Wait for answer
-                    answer = await self._wait_for_answer()
-                    context["last_result"] = f"User provided: {answer}"
-
-                elif result["status"] == "continue":
-                    context["last_result"] = result.get("output", "")
-                    context["completed_actions"].extend(result.get("actions", []))
-
-                elif result["status"] == "error":
-                    logger.error(f"Cycle error: {result.get('error')}")
-                    context["last_result"] = f"ERROR: {result.get('error')}"
-
-                self.cycle_count += 1
-
-                # Progress update every 5 cycles
-                if self.cycle_count % 5 == 0:
-                    await self._report_progress(context)
-
-            except Exception as e:
-                logger.error(f"Cycle exception: {e}")
-                await asyncio.sleep(5)
+        # Main build loop; each execution-log entry is appended to the JSONL file as it happens
+        self._log_fp = await asyncio.to_thread(open, self._log_path, 'a', buffering=1 << 16)
+        backoff, fail_streak = _RETRY_BACKOFF_START, 0
+        try:
+            while self.running and self.cycle_count < self.max_cycles:
+                try:
+                    result = await self._run_cycle(context)
+
+                    if result["status"] == "complete":
+                        logger.info(f"Job {self.job_id} completed")
+                        await self._finalize_job()
+                        break
+
+                    elif result["status"] == "blocked":
+                        await self._handle_blocker(result["reason"])
+                        # Wait for answer
+                        answer = await self._wait_for_answer()
+                        context["last_result"] = f"User provided: {answer}"
+
+                    elif result["status"] == "continue":
+                        context["last_result"] = result.get("output", "")
+                        context["completed_actions"].extend(result.get("actions", []))
+
+                    elif result["status"] == "error":
+                        logger.error(f"Cycle error: {result.get('error')}")
+                        context["last_result"] = f"ERROR: {result.get('error')}"
+
+                    self.cycle_count += 1
+
+                    # Progress update every 5 cycles
+                    if self.cycle_count % 5 == 0:
+                        await self._report_progress(context)
+
+                    backoff, fail_streak = _RETRY_BACKOFF_START, 0
+
+                except Exception as e:
+                    fail_streak += 1
+                    logger.error(f"Cycle exception ({fail_streak}/{_RETRY_FAIL_LIMIT}): {e}")
+                    if fail_streak >= _RETRY_FAIL_LIMIT:
+                        # A persistent error never advances cycle_count, so max_cycles can't stop it
+                        logger.error(f"Job {self.job_id} stopped after {fail_streak} consecutive cycle failures")
+                        if self.telegram_callback:
+                            await self.telegram_callback(
+                                None,
+                                f"❌ **Job Stopped**: {self.job_id}\n\n{fail_streak} cycles failed in a row. Last error: {e}"
+                            )
+                        break
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, _RETRY_BACKOFF_MAX)
+        finally:
+            await asyncio.to_thread(self._log_fp.close)
+            self._log_fp = None
 
         if self.cycle_count >= self.max_cycles:
             logger.warning(f"Job {self.job_id} hit max cycles ({self.max_cycles})")
@@ -126,20 +241,25 @@ class ScriptInvoker:
         prompt = self._build_cycle_prompt(context)
 
         # Call Claude in print mode
-        claude_path = os.path.expanduser("~/.local/bin/claude")
         try:
-            result = subprocess.run(
-                [claude_path, "-p", prompt],
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 min per cycle
+            proc = await asyncio.create_subprocess_exec(
+                _CLAUDE_PATH, "-p", prompt,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
                 cwd=self.constitution_dir
             )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    proc.communicate(),
+                    timeout=300  # 5 min per cycle
+                )
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return {"status": "error", "error": "Claude timeout"}
 
-            response = result.stdout if result.returncode == 0 else result.stderr
+            response = (stdout if proc.returncode == 0 else stderr).decode(errors='replace')
 
-        except subprocess.TimeoutExpired:
-            return {"status": "error", "error": "Claude timeout"}
         except Exception as e:
             return {"status": "error", "error": str(e)}
 
@@ -148,81 +268,50 @@ class ScriptInvoker:
 
     def _build_cycle_prompt(self, context: Dict) -> str:
         """Build the prompt for this cycle."""
-        completed = "\n".join(f"- {a}" for a in context["completed_actions"][-10:])
-        last = context.get("last_result", "None")[:500]
-
-        return f"""You are the Omega Build Agent working on job: {self.job_id}
-
-## Job Description
-{context["job"][:2000]}
-
-## Current Phase: {context["phase"]}
-
-## Completed Actions (recent)
-{completed or "None yet"}
+        completed = "\n".join(f"- {a}" for a in context["completed_actions"])
+        last = (context.get("last_result") or "None")[:500]
 
-## Last Result
-{last}
-
-## Your Task
-Determine the NEXT action needed. Respond with ONE of these formats:
-
-### To execute a bash command:
-```bash
-<your command here>
-```
-
-### To create/write a file:
-```write:path/to/file.ext
-<file content>
-```
-
-### To indicate you need user input:
-```blocked
-REASON: <what you need from the user>
-```
-
-### To indicate the job is complete:
-```complete
-SUMMARY: <what was built>
-```
-
-### To indicate the next phase:
-```phase:<phase_name>
-```
-
-IMPORTANT:
-- Output ONLY ONE action per response
-- Prefer simple, atomic commands
-- Check results before proceeding
-- If stuck, request user input via blocked
-
-What's the next action?"""
+        return self._prompt_head + _CYCLE_PROMPT_TAIL.format_map({
+            "phase": context["phase"],
+            "completed": completed or "None yet",
+            "last": last,
+        })
 
     async def _parse_and_execute(self, response: str) -> Dict:
         """Parse Claude's response and execute if needed."""
 
-        # Check for completion
-        if "```complete" in response:
-            match = re.search(r'```complete\s*\n?(.*?)```', response, re.DOTALL)
-            summary = match.group(1) if match else "Build completed"
+        # Runaway replies are cut before any scanning
+        response = response[:_RESPONSE_MAX]
+
+        # One scan over the response; keep the highest-priority fence found
+        best, best_rank = None, len(_ACTION_PRIORITY)
+        # No fence at all (plain prose): skip the regex and both substring checks below
+        fenced = '```' in response
+        for match in (_ACTION_RE.finditer(response) if fenced else ()):
+            rank = next(r for r, name in enumerate(_ACTION_PRIORITY) if match.group(name) is not None)
+            if rank < best_rank:
+                best, best_rank = match, rank
+                if rank == 0:
+                    break
+
+        # Check for completion (an unterminated fence still counts)
+        if best_rank == 0 or fenced and "```complete" in response:
+            summary = best.group("complete_body") if best_rank == 0 else "Build completed"
             return {"status": "complete", "summary": summary}
 
         # Check for blocker
-        if "```blocked" in response:
-            match = re.search(r'```blocked\s*\n?(.*?)```', response, re.DOTALL)
-            reason = match.group(1) if match else "Unknown blocker"
+        if best_rank == 1 or fenced and "```blocked" in response:
+            reason = best.group("blocked_body") if best_rank == 1 else "Unknown blocker"
             return {"status": "blocked", "reason": reason}
 
         # Check for phase change
-        phase_match = re.search(r'```phase:(\w+)', response)
-        if phase_match:
-            return {"status": "continue", "phase": phase_match.group(1), "actions": [f"Phase: {phase_match.group(1)}"]}
+        if best_rank == 2:
+            phase = best.group("phase")
+            return {"status": "continue", "phase": phase, "actions": [f"Phase: {phase}"]}
 
         # Check for bash command
-        bash_match = re.search(r'```bash\s*\n(.*?)```', response, re.DOTALL)
-        if bash_match:
-            command = bash_match.group(1).strip()
+        if best_rank == 3:
+            command = best.group("bash").strip()
             output = await self._execute_bash(command)
             return {
                 "status": "continue",
@@ -231,10 +320,9 @@ What's the next action?"""
             }
 
         # Check for file write
-        write_match = re.search(r'```write:([^\n]+)\n(.*?)```', response, re.DOTALL)
-        if write_match:
-            filepath = write_match.group(1).strip()
-            content = write_match.group(2)
+        if best_rank == 4:
+            filepath = best.group("write_path").strip()
+            content = best.group("write_body")
             output = await self._write_file(filepath, content)
             return {
                 "status": "continue",
@@ -257,28 +345,30 @@ What's the next action?"""
             return f"BLOCKED: Dangerous command rejected: {command}"
 
         try:
-            result = subprocess.run(
+            proc = await asyncio.create_subprocess_shell(
                 command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=120,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
                 cwd=self.constitution_dir
             )
-
-            output = result.stdout + result.stderr
-            self.execution_log.append({
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return "ERROR: Command timed out"
+
+            output = (stdout + stderr).decode(errors='replace')
+            await self._log_execution({
                 "type": "bash",
                 "command": command,
                 "output": output[:500],
-                "returncode": result.returncode,
+                "returncode": proc.returncode,
                 "time": datetime.now().isoformat()
             })
 
             return output[:1000]
 
-        except subprocess.TimeoutExpired:
-            return "ERROR: Command timed out"
         except Exception as e:
             return f"ERROR: {str(e)}"
 
@@ -290,12 +380,10 @@ What's the next action?"""
 
         try:
             # Create parent directories
-            Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-
-            with open(filepath, 'w') as f:
-                f.write(content)
+            await asyncio.to_thread(Path(filepath).parent.mkdir, parents=True, exist_ok=True)
+            await asyncio.to_thread(_write_text, filepath, content)
 
-            self.execution_log.append({
+            await self._log_execution({
                 "type": "write",
                 "path": filepath,
                 "size": len(content),
@@ -307,16 +395,25 @@ What's the next action?"""
         except Exception as e:
             return f"ERROR writing file: {str(e)}"
 
+    async def _log_execution(self, entry: Dict):
+        """Keep entry in the recent ring and append it to the JSONL log as one line."""
+        self.execution_log.append(entry)
+        if self._log_fp:
+            await asyncio.to_thread(self._log_fp.write, json.dumps(entry, separators=(',', ':')) + '\n')
+
     async def _handle_blocker(self, reason: str):
         """Handle a blocker that needs user input."""
         # Use new BLOCKED- prefix format
         blocker_file = os.path.join(self.blockers_dir, f"BLOCKED-{self.job_id}.md")
 
-        with open(blocker_file, 'w') as f:
-            f.write(f"# Blocker: {self.job_id}\n\n")
-            f.write(f"**Time**: {datetime.now().isoformat()}\n")
-            f.write(f"**Cycle**: {self.cycle_count}\n\n")
-            f.write(f"## Reason\n\n{reason}\n")
+        await asyncio.to_thread(
+            _write_text,
+            blocker_file,
+            f"# Blocker: {self.job_id}\n\n"
+            f"**Time**: {datetime.now().isoformat()}\n"
+            f"**Cycle**: {self.cycle_count}\n\n"
+            f"## Reason\n\n{reason}\n"
+        )
 
         if self.telegram_callback:
             await self.telegram_callback(
@@ -330,69 +427,98 @@ What's the next action?"""
         answer_file = os.path.join(self.blockers_dir, f"ANSWER-{self.job_id}.md")
 
         while self.running:
-            if os.path.exists(answer_file):
-                with open(answer_file, 'r') as f:
-                    content = f.read()
-
-                # Extract answer
-                match = re.search(r'## Answer\s*\n+(.+)', content, re.DOTALL)
-                answer = match.group(1).strip() if match else content.strip()
+            if self._answer is not None:
+                answer, self._answer = self._answer, None
+                self._answer_ready.clear()
+                return answer
 
-                # Clean up
-                os.remove(answer_file)
+            answer = await asyncio.to_thread(self._consume_answer_file, answer_file)
+            if answer is not None:
                 return answer
 
-            await asyncio.sleep(5)
+            # Woken at once by send_input or the runner's watcher; the timeout is the polling fallback
+            try:
+                await asyncio.wait_for(self._answer_ready.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                pass
+            self._answer_ready.clear()
 
         return ""
 
+    @staticmethod
+    def _consume_answer_file(answer_file: str) -> Optional[str]:
+        """Read and delete ANSWER-{job_id}.md; None if it isn't there yet."""
+        try:
+            with open(answer_file, 'r') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+
+        # Extract answer
+        match = _ANSWER_RE.search(content)
+        answer = match.group(1).strip() if match else content.strip()
+
+        # Clean up
+        os.remove(answer_file)
+        return answer
+
     async def _report_progress(self, context: Dict):
         """Write progress to file and outbox for Telegram."""
         progress_file = os.path.join(self.progress_dir, f"{self.job_id}-progress.md")
 
-        recent_actions = context["completed_actions"][-10:]
+        recent_actions = list(context["completed_actions"])
         timestamp = datetime.now().isoformat()
 
         # Write to progress file (detailed log)
-        with open(progress_file, 'a') as f:
-            f.write(f"\n\n---\n## Cycle {self.cycle_count}\n")
-            f.write(f"**Time**: {timestamp}\n")
-            f.write(f"**Phase**: {context['phase']}\n\n")
-            f.write("### Recent Actions\n")
-            for action in recent_actions:
-                f.write(f"- {action}\n")
+        progress = (
+            f"\n\n---\n## Cycle {self.cycle_count}\n"
+            f"**Time**: {timestamp}\n"
+            f"**Phase**: {context['phase']}\n\n"
+            "### Recent Actions\n"
+            + "".join(f"- {action}\n" for action in recent_actions)
+        )
 
         # Write to outbox (AI-native format for Telegram)
-        Path(self.outbox_dir).mkdir(parents=True, exist_ok=True)
         report_file = os.path.join(
             self.outbox_dir,
             f"REPORT-{self.job_id}-{self.cycle_count}.md"
         )
-        with open(report_file, 'w') as f:
-            f.write(f"# Report: {self.job_id}\n\n")
-            f.write(f"**Time**: {timestamp}\n")
-            f.write(f"**Phase**: {context['phase']}\n")
-            f.write(f"**Cycle**: {self.cycle_count}\n")
-            f.write(f"**Status**: IN_PROGRESS\n\n")
-            f.write("## Summary\n\n")
-            for action in recent_actions[-5:]:
-                f.write(f"- {action}\n")
-            f.write("\n## Next\n\nContinuing build...\n")
+        report = (
+            f"# Report: {self.job_id}\n\n"
+            f"**Time**: {timestamp}\n"
+            f"**Phase**: {context['phase']}\n"
+            f"**Cycle**: {self.cycle_count}\n"
+            f"**Status**: IN_PROGRESS\n\n"
+            "## Summary\n\n"
+            + "".join(f"- {action}\n" for action in recent_actions[-5:])
+            + "\n## Next\n\nContinuing build...\n"
+        )
+
+        def _write_reports():
+            _write_text(progress_file, progress, 'a')
+            Path(self.outbox_dir).mkdir(parents=True, exist_ok=True)
+            _write_text(report_file, report)
 
         if self.telegram_callback:
             summary = f"Cycle {self.cycle_count} - {context['phase']}\n"
             summary += "\n".join(f"• {a[:50]}" for a in recent_actions[:3])
-            await self.telegram_callback(
-                None,
-                f"📊 **Progress**: {self.job_id}\n\n{summary}"
+            # Independent of each other, so the disk write and the Telegram round-trip overlap
+            await asyncio.gather(
+                asyncio.to_thread(_write_reports),
+                self.telegram_callback(
+                    None,
+                    f"📊 **Progress**: {self.job_id}\n\n{summary}"
+                )
             )
+        else:
+            await asyncio.to_thread(_write_reports)
 
     async def _finalize_job(self):
         """Mark job as complete."""
-        # Write execution log
-        log_file = os.path.join(self.progress_dir, f"{self.job_id}-execution-log.json")
-        with open(log_file, 'w') as f:
-            json.dump(self.execution_log, f, indent=2)
+        # Execution log has been streamed all along; make sure it's on disk before reporting
+        log_file = self._log_path
+        if self._log_fp:
+            await asyncio.to_thread(self._log_fp.flush)
 
         if self.telegram_callback:
             await self.telegram_callback(
@@ -402,6 +528,11 @@ What's the next action?"""
                 f"Execution log: {log_file}"
             )
 
+    async def send_input(self, text: str):
+        """Deliver the user's answer to a blocked build cycle."""
+        self._answer = text
+        self._answer_ready.set()
+
     def stop(self):
         """Stop the invoker."""
         self.running = False
@@ -1,6 +1,7 @@
 # core/skill_loader.py — Omega Claw Skills Auto-Loader
 # SECURITY §3.4: Skills are validated before execution.
 import os
+import ast
 import json
 import hashlib
 import importlib.util
@@ -11,6 +12,53 @@ TRUST_FILE = os.path.join(SKILLS_DIR, ".trusted_hashes.json")
 
 # SECURITY §3.4: Only these imports are allowed in skill handlers
 FORBIDDEN_IMPORTS = ["subprocess", "shutil", "socket", "http", "urllib", "requests", "os.system"]
+_FORBIDDEN = frozenset(FORBIDDEN_IMPORTS)
+# Identifies the rule set a trust record was scanned under; a change forces a rescan
+_RULES_ID = ",".join(sorted(_FORBIDDEN))
+# Calls that import a module named by their first argument
+_DYNAMIC_IMPORTS = frozenset({"__import__", "import_module"})
+
+
+def _forbidden_module(dotted: str):
+    """Return the FORBIDDEN_IMPORTS entry that dotted is or lives under, else None."""
+    parts = dotted.split(".")
+    for i in range(1, len(parts) + 1):
+        prefix = ".".join(parts[:i])
+        if prefix in _FORBIDDEN:
+            return prefix
+    return None
+
+
+def _find_forbidden_import(tree: ast.AST):
+    """One walk over the handler's AST; the first forbidden (or unverifiable) import, else None."""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                hit = _forbidden_module(alias.name)
+                if hit:
+                    return hit
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            hit = _forbidden_module(node.module)
+            if hit:
+                return hit
+            # from os import system
+            for alias in node.names:
+                hit = _forbidden_module(f"{node.module}.{alias.name}")
+                if hit:
+                    return hit
+        elif isinstance(node, ast.Call):
+            # __import__(...) or importlib.import_module(...)
+            func = node.func
+            fname = getattr(func, "id", None) or getattr(func, "attr", None)
+            if fname in _DYNAMIC_IMPORTS and node.args:
+                arg = node.args[0]
+                if not (isinstance(arg, ast.Constant) and isinstance(arg.value, str)):
+                    return f"{fname}(<dynamic>)"
+                hit = _forbidden_module(arg.value)
+                if hit:
+                    return hit
+    return None
+
 
 class SkillLoader:
     """
@@ -20,11 +68,12 @@ class SkillLoader:
     
     def __init__(self):
         self.loaded_skills = {}
+        self._trust_dirty = False
         self._load_trust()
         self._scan()
     
     def _load_trust(self):
-        """Load trusted handler hashes."""
+        """Load trusted handler records: name -> {sha256, mtime_ns, size, rules}."""
         self.trusted_hashes = {}
         if os.path.exists(TRUST_FILE):
             try:
@@ -32,6 +81,10 @@ class SkillLoader:
                     self.trusted_hashes = json.load(f)
             except:
                 pass
+        # Older trust files stored the bare hash; keep it so change warnings still fire
+        for name, record in self.trusted_hashes.items():
+            if isinstance(record, str):
+                self.trusted_hashes[name] = {"sha256": record}
     
     def _save_trust(self):
         """Save trusted handler hashes."""
@@ -39,26 +92,36 @@ class SkillLoader:
             json.dump(self.trusted_hashes, f, indent=2)
     
     def _scan(self):
-        if not os.path.exists(SKILLS_DIR):
+        # One scandir pass: DirEntry caches the file type from readdir, so is_dir() needs no stat
+        try:
+            with os.scandir(SKILLS_DIR) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except FileNotFoundError:
             logging.info("SkillLoader: No skills/ directory found.")
             return
         
-        for entry in sorted(os.listdir(SKILLS_DIR)):
-            skill_dir = os.path.join(SKILLS_DIR, entry)
-            
-            # Skip non-directories and the template
-            if not os.path.isdir(skill_dir) or entry.startswith("_"):
+        for entry in entries:
+            # Skip the template and non-directories (name check first, it's free)
+            if entry.name.startswith("_") or not entry.is_dir():
                 continue
             
-            config_path = os.path.join(skill_dir, "skill.json")
+            config_path = os.path.join(entry.path, "skill.json")
             if not os.path.exists(config_path):
-                logging.warning(f"SkillLoader: {entry}/ has no skill.json — skipping")
+                logging.warning(f"SkillLoader: {entry.name}/ has no skill.json — skipping")
                 continue
             
             try:
-                self._load_skill(entry, skill_dir, config_path)
+                self._load_skill(entry.name, entry.path, config_path)
             except Exception as e:
-                logging.error(f"SkillLoader: Failed to load {entry}: {e}")
+                logging.error(f"SkillLoader: Failed to load {entry.name}: {e}")
+        
+        # One trust-file write per boot, and none if every handler was unchanged
+        if self._trust_dirty:
+            try:
+                self._save_trust()
+                self._trust_dirty = False
+            except OSError as e:
+                logging.error(f"SkillLoader: Could not save trust file: {e}")
     
     def _load_skill(self, name: str, skill_dir: str, config_path: str):
         with open(config_path, 'r') as f:
@@ -95,29 +158,41 @@ class SkillLoader:
     
     def _security_scan(self, name: str, handler_path: str):
         """SECURITY §3.4: Scan handler for forbidden patterns before loading."""
-        with open(handler_path, 'r') as f:
+        st = os.stat(handler_path)
+        trusted = self.trusted_hashes.get(name, {})
+        # Fast path: same size and mtime as when it last passed this rule set -> no read, no hash
+        if (trusted.get("mtime_ns") == st.st_mtime_ns and trusted.get("size") == st.st_size
+                and trusted.get("rules") == _RULES_ID):
+            return
+        
+        with open(handler_path, 'rb') as f:
             source = f.read()
         
-        # Check for forbidden imports
-        for forbidden in FORBIDDEN_IMPORTS:
-            if f"import {forbidden}" in source or f"from {forbidden}" in source:
-                raise SecurityError(
-                    f"SECURITY VIOLATION: Skill '{name}' uses forbidden import '{forbidden}'. "
-                    f"Skills cannot access subprocess, network, or filesystem operations."
-                )
+        # Check for forbidden imports (real import statements and import calls, not comments or strings)
+        forbidden = _find_forbidden_import(ast.parse(source, filename=handler_path))
+        if forbidden:
+            raise SecurityError(
+                f"SECURITY VIOLATION: Skill '{name}' uses forbidden import '{forbidden}'. "
+                f"Skills cannot access subprocess, network, or filesystem operations."
+            )
         
         # Hash verification — warn if handler changed since last trust
-        current_hash = hashlib.sha256(source.encode()).hexdigest()
-        if name in self.trusted_hashes:
-            if self.trusted_hashes[name] != current_hash:
-                logging.warning(
-                    f"SECURITY: Skill '{name}' handler has been modified since last trusted load. "
-                    f"Old hash: {self.trusted_hashes[name][:16]}... New hash: {current_hash[:16]}..."
-                )
+        current_hash = hashlib.sha256(source).hexdigest()
+        old_hash = trusted.get("sha256")
+        if old_hash and old_hash != current_hash:
+            logging.warning(
+                f"SECURITY: Skill '{name}' handler has been modified since last trusted load. "
+                f"Old hash: {old_hash[:16]}... New hash: {current_hash[:16]}..."
+            )
         
-        # Trust on first load, warn on change
-        self.trusted_hashes[name] = current_hash
-        self._save_trust()
+        # Trust on first load, warn on change (saved once at the end of _scan)
+        self.trusted_hashes[name] = {
+            "sha256": current_hash,
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "rules": _RULES_ID,
+        }
+        self._trust_dirty = True
     
     def get_intent_patterns(self) -> dict:
         """Return all skill intent patterns for the IntentAgent."""
@@ -138,6 +213,17 @@ class SkillLoader:
         return len(self.loaded_skills)
 
 
+_loader = None
+
+
+def get_skill_loader() -> SkillLoader:
+    """Process-wide SkillLoader: skills/ is scanned and each handler imported once, however many callers ask."""
+    global _loader
+    if _loader is None:
+        _loader = SkillLoader()
+    return _loader
+
+
 class SecurityError(Exception):
     """Raised when a skill violates SECURITY.xml rules."""
     pass
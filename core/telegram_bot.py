@@ -5,12 +5,22 @@ import asyncio
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, CallbackQueryHandler, filters, ContextTypes
 from core.orchestrator import Orchestrator
+from core.mcp_wizard import handle_wizard_input
+from db.database import get_wizard_state, get_autonomy_mode, set_autonomy_mode
+
+# Optional: libuv event loop (lower per-callback and per-poll overhead than the selector loop)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
 
 orchestrator = Orchestrator()
 
 # Global reference to app for autonomous runner to send messages
 _app = None
 _autonomous_runner = None
+_autonomous_task = None
 
 # Authorized users
 def _parse_allowed_users():
@@ -23,6 +33,8 @@ def _parse_allowed_users():
     return users
 
 ALLOWED_USERS = _parse_allowed_users()
+# Membership checks run on every update; the list keeps config order (ALLOWED_USERS[0] is the default recipient)
+_ALLOWED_SET = frozenset(ALLOWED_USERS)
 
 async def auth_check(update: Update) -> bool:
     """Reject unauthorized users. Deny-by-default per SECURITY.xml §5.4."""
@@ -31,7 +43,7 @@ async def auth_check(update: Update) -> bool:
         logging.critical("SECURITY: ALLOWED_USERS is empty — denying ALL access. Set TELEGRAM_ALLOWED_USER_IDS in .env")
         await update.message.reply_text("⛔ Bot not configured. Contact admin.")
         return False
-    if user_id not in ALLOWED_USERS:
+    if user_id not in _ALLOWED_SET:
         await update.message.reply_text("⛔ Unauthorized.")
         logging.warning(f"SECURITY: Unauthorized access attempt from user {user_id}")
         return False
@@ -52,6 +64,19 @@ async def handle_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         parse_mode="Markdown"
     )
 
+# Telegram rejects messages over 4096 chars; leave headroom for Markdown entities
+_TG_CHUNK = 4000
+
+
+async def _send_long(message, text: str):
+    """Reply with text, split into _TG_CHUNK pieces sent in order (concurrent sends may arrive shuffled)."""
+    if len(text) <= _TG_CHUNK:
+        # Nearly every reply: one send, no slicing
+        await message.reply_text(text, parse_mode="Markdown")
+        return
+    for i in range(0, len(text), _TG_CHUNK):
+        await message.reply_text(text[i:i + _TG_CHUNK], parse_mode="Markdown")
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Route all text messages through the Orchestrator."""
     if not await auth_check(update): return
@@ -61,25 +86,15 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     try:
         # Check wizard
-        from db.database import get_wizard_state
         wizard_state = get_wizard_state(user_id)
         if wizard_state:
-            from core.mcp_wizard import handle_wizard_input
-            response = handle_wizard_input(user_id, user_text, wizard_state)
-            if len(response) > 4000:
-                for i in range(0, len(response), 4000):
-                    await update.message.reply_text(response[i:i+4000], parse_mode="Markdown")
-            else:
-                await update.message.reply_text(response, parse_mode="Markdown")
+            # The final step writes the MCP config and .env: keep that file I/O off the event loop
+            response = await asyncio.to_thread(handle_wizard_input, user_id, user_text, wizard_state)
+            await _send_long(update.message, response)
             return
 
         response = await orchestrator.handle_message(user_id, user_text)
-        # Split long messages for Telegram's 4096 char limit
-        if len(response) > 4000:
-            for i in range(0, len(response), 4000):
-                await update.message.reply_text(response[i:i+4000], parse_mode="Markdown")
-        else:
-            await update.message.reply_text(response, parse_mode="Markdown")
+        await _send_long(update.message, response)
     except Exception as e:
         logging.error(f"Message handling failed: {e}", exc_info=True)
         await update.message.reply_text("❌ Something went wrong. The error has been logged.")
@@ -95,7 +110,6 @@ async def handle_mode(update: Update, context: ContextTypes.DEFAULT_TYPE):
     ]
     reply_markup = InlineKeyboardMarkup(keyboard)
     
-    from db.database import get_autonomy_mode
     current_mode = get_autonomy_mode(update.effective_user.id)
     
     await update.message.reply_text(
@@ -112,12 +126,11 @@ async def handle_mode_callback(update: Update, context: ContextTypes.DEFAULT_TYP
     await query.answer()
     
     user_id = query.from_user.id
-    if user_id not in ALLOWED_USERS:
+    if user_id not in _ALLOWED_SET:
         return
         
     _, mode = query.data.split(":")
     
-    from db.database import set_autonomy_mode
     set_autonomy_mode(user_id, mode)
     
     await query.edit_message_text(
@@ -125,25 +138,27 @@ async def handle_mode_callback(update: Update, context: ContextTypes.DEFAULT_TYP
         parse_mode="Markdown"
     )
 
-async def send_telegram_message(user_id: int, message: str):
-    """Send a message to a user via Telegram (used by autonomous runner)."""
+async def send_telegram_message(user_id: int, message: str) -> bool:
+    """Send a message to a user via Telegram (used by autonomous runner). Returns False if it failed."""
     global _app
-    if _app and user_id:
-        try:
-            await _app.bot.send_message(chat_id=user_id, text=message, parse_mode="Markdown")
-        except Exception as e:
-            logging.error(f"Failed to send Telegram message: {e}")
-    elif _app and ALLOWED_USERS:
+    if not _app:
+        return False
+    if not user_id:
+        if not ALLOWED_USERS:
+            return False
         # If no specific user, send to first allowed user
-        try:
-            await _app.bot.send_message(chat_id=ALLOWED_USERS[0], text=message, parse_mode="Markdown")
-        except Exception as e:
-            logging.error(f"Failed to send Telegram message: {e}")
+        user_id = ALLOWED_USERS[0]
+    try:
+        await _app.bot.send_message(chat_id=user_id, text=message, parse_mode="Markdown")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to send Telegram message: {e}")
+        return False
 
 
 async def start_autonomous_runner():
     """Start the autonomous job runner in background."""
-    global _autonomous_runner
+    global _autonomous_runner, _autonomous_task
 
     # Check if autonomous mode is enabled
     if os.getenv("OMEGA_AUTONOMOUS_MODE", "false").lower() != "true":
@@ -154,16 +169,33 @@ async def start_autonomous_runner():
     _autonomous_runner = AutonomousRunner(telegram_callback=send_telegram_message)
 
     logging.info("🤖 Autonomous Runner starting...")
-    asyncio.create_task(_autonomous_runner.start())
+    _autonomous_task = asyncio.create_task(_autonomous_runner.start())
 
 
 async def post_init(application):
     """Called after the bot is initialized."""
     global _app
     _app = application
+    # Python 3.12+: handler tasks run inline until their first real await, so replies that
+    # never suspend (auth rejects, quick DB lookups) skip a scheduler round-trip
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    from core.log_queue import start_flush_worker
+    start_flush_worker()
     await start_autonomous_runner()
 
 
+async def post_stop(application):
+    """Called once the bot has stopped (its HTTP client still up): flush pending notifications and the command log."""
+    # run_polling() doesn't cancel tasks started with a bare create_task, so stop them here
+    if _autonomous_runner:
+        await _autonomous_runner.stop()
+        # start() returns once its queued notifications are drained
+        await asyncio.gather(_autonomous_task, return_exceptions=True)
+    from core.log_queue import stop_flush_worker
+    await stop_flush_worker()
+
+
 def run_bot():
     """Start the Telegram polling loop."""
     global _app
@@ -173,7 +205,12 @@ def run_bot():
         logging.critical("TELEGRAM_BOT_TOKEN not set!")
         exit(1)
 
-    app = ApplicationBuilder().token(token).post_init(post_init).build()
+    # Must be in place before PTB creates the loop that run_polling() drives
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
+        logging.info("⚡ uvloop event loop enabled")
+
+    app = ApplicationBuilder().token(token).post_init(post_init).post_stop(post_stop).build()
     app.add_handler(CommandHandler("start", handle_start))
     app.add_handler(CommandHandler("mode", handle_mode))
     app.add_handler(CallbackQueryHandler(handle_mode_callback, pattern="^mode:"))
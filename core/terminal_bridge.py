@@ -10,9 +10,10 @@ No API costs. Full tool access. Real AI understanding.
 
 import os
 import re
+import time
 import asyncio
 import logging
-from typing import Optional, Callable
+from typing import Optional, Callable, Union
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,67 @@ except ImportError:
     PEXPECT_AVAILABLE = False
     logger.warning("pexpect not installed. Run: pip install pexpect")
 
+# Bytes pexpect pulls from the PTY per read (its default is 2000)
+_READ_SIZE = 65536
+
+# How long an isalive() result is trusted before polling waitpid again
+_ALIVE_CACHE_SECONDS = 1.0
+
+# Environment for the Claude child, built on first start() and reused on restarts
+_ENV_CACHE: dict = {}
+
+# Claude's input prompt alone on the last line of the buffer = response done.
+# The bridge runs pexpect in bytes mode, so » and › are matched as UTF-8.
+_CLAUDE_PROMPT_RE = re.compile(rb'(?:^|\n)[ \t]*(?:>|\xc2\xbb|\xe2\x80\xba)[ \t]*$')
+
+# Output must stay quiet this long after a prompt match before it is accepted
+_PROMPT_QUIET_SECONDS = 0.3
+_PROMPT_CHARS_RE = re.compile(rb'>|\xc2\xbb|\xe2\x80\xba')
+
+
+def _strip_ansi(data: bytes) -> Union[bytes, bytearray]:
+    """
+    Remove ANSI escapes: ESC + one byte in @-_ (except '['), or a CSI
+    sequence ESC [ params(0-?)* intermediates( -/)* final(@-~).
+    Jumps between escapes with bytes.find (memchr) and copies the clean runs
+    as slices; unrecognised ESCs are kept, as the old regex did.
+    """
+    if b'\x1B' not in data:
+        return data
+    out = bytearray()
+    pos, n = 0, len(data)
+    while True:
+        i = data.find(b'\x1B', pos)
+        if i == -1:
+            out += data[pos:]
+            return out
+        out += data[pos:i]
+        j = i + 1
+        if j < n:
+            c = data[j]
+            if c == 0x5B:  # '['
+                k = j + 1
+                while k < n and 0x30 <= data[k] <= 0x3F:
+                    k += 1
+                while k < n and 0x20 <= data[k] <= 0x2F:
+                    k += 1
+                if k < n and 0x40 <= data[k] <= 0x7E:
+                    pos = k + 1
+                    continue
+            elif 0x40 <= c <= 0x5F:
+                pos = j + 1
+                continue
+        out += b'\x1B'
+        pos = j
+
+
+def _build_env() -> dict:
+    """Return the cached os.environ copy with TERM=dumb."""
+    if not _ENV_CACHE:
+        _ENV_CACHE.update(os.environ)
+        _ENV_CACHE['TERM'] = 'dumb'
+    return _ENV_CACHE
+
 
 class TerminalBridge:
     """
@@ -43,6 +105,7 @@ class TerminalBridge:
         self.ready = False
         self.busy = False
         self.message_queue = asyncio.Queue()
+        self._alive_cache = (0.0, False)  # (monotonic time, isalive result)
 
     async def start(self) -> bool:
         """Spawn Claude Code in a PTY."""
@@ -58,10 +121,10 @@ class TerminalBridge:
             logger.info("Spawning Claude Code...")
             self.claude_process = pexpect.spawn(
                 claude_path,
-                encoding='utf-8',
                 timeout=300,
+                maxread=_READ_SIZE,
                 cwd=self.constitution_dir,
-                env={**os.environ, 'TERM': 'dumb'},
+                env=_build_env(),
                 dimensions=(50, 200)  # rows, cols
             )
 
@@ -81,9 +144,9 @@ class TerminalBridge:
         try:
             # Look for common ready indicators
             self.claude_process.expect([
-                r'[>»›]',           # Prompt characters
-                r'How can I',       # Greeting
-                r'help you',        # Part of greeting
+                _PROMPT_CHARS_RE,   # Prompt characters
+                b'How can I',       # Greeting
+                b'help you',        # Part of greeting
                 pexpect.TIMEOUT
             ], timeout=30)
         except pexpect.TIMEOUT:
@@ -110,7 +173,7 @@ class TerminalBridge:
         try:
             # Clear any pending output
             try:
-                self.claude_process.read_nonblocking(size=10000, timeout=0.1)
+                self.claude_process.read_nonblocking(size=_READ_SIZE, timeout=0.1)
             except pexpect.TIMEOUT:
                 pass
 
@@ -129,64 +192,59 @@ class TerminalBridge:
             self.busy = False
 
     async def _collect_response(self, timeout: int) -> str:
-        """Collect Claude's response until it's done."""
-        response_parts = []
-        start_time = asyncio.get_event_loop().time()
-        silence_start = None
+        """Collect Claude's response until the prompt comes back."""
+        loop = asyncio.get_running_loop()
+        index, raw = await loop.run_in_executor(None, self._expect_prompt, self.claude_process, timeout)
+        if index == 1:
+            logger.warning("Response timeout")
+        elif index == 2:
+            logger.warning("Claude process ended")
 
-        while True:
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed > timeout:
-                logger.warning("Response timeout")
-                break
+        # Clean up response
+        return self._clean_response(raw)
 
+    @staticmethod
+    def _expect_prompt(proc, timeout: int):
+        """
+        Wait for the prompt, then require a short quiet window before trusting it:
+        a '>' that happens to end one read is only a prompt if nothing follows.
+        Returns the pexpect index and everything read before the prompt.
+        """
+        deadline = time.monotonic() + timeout
+        chunks = []
+        while True:
+            index = proc.expect(
+                [_CLAUDE_PROMPT_RE, pexpect.TIMEOUT, pexpect.EOF],
+                timeout=max(deadline - time.monotonic(), 0)
+            )
+            chunks.append(proc.before or b'')
+            if index != 0:
+                return index, b''.join(chunks)
+            prompt = proc.after
             try:
-                # Read available output
-                chunk = self.claude_process.read_nonblocking(size=4096, timeout=0.5)
-                if chunk:
-                    response_parts.append(chunk)
-                    silence_start = None  # Reset silence timer
-                else:
-                    # No output - start silence timer
-                    if silence_start is None:
-                        silence_start = asyncio.get_event_loop().time()
-
+                more = proc.read_nonblocking(_READ_SIZE, timeout=_PROMPT_QUIET_SECONDS)
             except pexpect.TIMEOUT:
-                # No output available
-                if silence_start is None:
-                    silence_start = asyncio.get_event_loop().time()
-
+                return 0, b''.join(chunks)
             except pexpect.EOF:
-                logger.warning("Claude process ended")
-                break
+                return 2, b''.join(chunks)
+            # More output arrived, so the match was mid-response: keep it and carry on
+            chunks.append(prompt)
+            proc.buffer = proc.buffer + more
 
-            # Check for silence (Claude done responding)
-            if silence_start:
-                silence_duration = asyncio.get_event_loop().time() - silence_start
-                # If 3+ seconds of silence after getting some output, assume done
-                if silence_duration > 3 and response_parts:
-                    break
-
-            await asyncio.sleep(0.1)
-
-        # Clean up response
-        raw_response = ''.join(response_parts)
-        return self._clean_response(raw_response)
-
-    def _clean_response(self, raw: str) -> str:
+    def _clean_response(self, raw: bytes) -> str:
         """Clean up Claude's response for Telegram."""
-        # Remove ANSI escape codes
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        cleaned = ansi_escape.sub('', raw)
+        # Remove ANSI escape codes, then decode once
+        cleaned = _strip_ansi(raw).decode('utf-8', errors='replace')
 
         # Remove the echoed input (first line is usually what we sent)
-        lines = cleaned.split('\n')
-        if len(lines) > 1:
-            lines = lines[1:]  # Skip echoed input
+        first_nl = cleaned.find('\n')
+        if first_nl != -1:
+            cleaned = cleaned[first_nl + 1:]
 
         # Remove prompt characters at end
-        cleaned = '\n'.join(lines).strip()
-        cleaned = re.sub(r'[>»›]\s*$', '', cleaned)
+        cleaned = cleaned.strip()
+        if cleaned and cleaned[-1] in '>»›':
+            cleaned = cleaned[:-1].rstrip()
 
         return cleaned
 
@@ -200,11 +258,19 @@ class TerminalBridge:
                 pass
         self.ready = False
         self.claude_process = None
+        self._alive_cache = (0.0, False)
         logger.info("Claude process stopped")
 
     @property
     def is_ready(self) -> bool:
-        return self.ready and self.claude_process and self.claude_process.isalive()
+        if not self.ready:
+            return False
+        now = time.monotonic()
+        checked, alive = self._alive_cache
+        if now - checked >= _ALIVE_CACHE_SECONDS:
+            alive = bool(self.claude_process and self.claude_process.isalive())
+            self._alive_cache = (now, alive)
+        return alive
 
 
 # Singleton instance for the bot to use
@@ -1,19 +1,32 @@
 # db/database.py — Omega Claw SQLite Layer
 import sqlite3
 import os
+import json
 import logging
-from datetime import datetime
-from cryptography.fernet import Fernet
+import threading
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+
+# Optional: rfernet (Rust) — same Fernet tokens, much less per-call overhead on short strings.
+# Its API differs slightly: str key, encrypt() returns str, decrypt() takes str.
+try:
+    from rfernet import Fernet
+    RFERNET_AVAILABLE = True
+except ImportError:
+    from cryptography.fernet import Fernet
+    RFERNET_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 DB_PATH = os.path.expanduser(os.getenv("OMEGA_CLAW_DB", "~/.omega-claw/omega_claw.db"))
 DB_KEY = os.getenv("OMEGA_CLAW_DB_KEY")
 
+# Built once at import from the raw base64 key (no KDF). If a password-based key is ever
+# supported, derive it here, once, and pass the bytes to Fernet; never per encrypt/decrypt.
 _fernet = None
 if DB_KEY:
     try:
-        _fernet = Fernet(DB_KEY.encode('utf-8'))
+        _fernet = Fernet(DB_KEY if RFERNET_AVAILABLE else DB_KEY.encode('utf-8'))
     except ValueError as e:
         logger.error(f"Invalid OMEGA_CLAW_DB_KEY: {e}. Ensure it is a valid 32-byte base64 string.")
 
@@ -23,138 +36,227 @@ if not _fernet:
 
 def encrypt_val(val: str) -> str:
     if not val or not _fernet: return val
-    return _fernet.encrypt(val.encode('utf-8')).decode('utf-8')
+    token = _fernet.encrypt(val.encode('utf-8'))
+    return token if RFERNET_AVAILABLE else token.decode('utf-8')
 
 
 def decrypt_val(val: str) -> str:
     if not val or not _fernet: return val
     try:
-        return _fernet.decrypt(val.encode('utf-8')).decode('utf-8')
+        return _fernet.decrypt(val if RFERNET_AVAILABLE else val.encode('utf-8')).decode('utf-8')
     except Exception:
         # Fallback for plaintext (seamless migration)
         return val
 
 
+# Job timestamps, read by SQLite itself: local time in the same ISO layout rows always had
+# (YYYY-MM-DDTHH:MM:SS.fff), so ORDER BY created_at keeps sorting old and new rows together
+_SQL_NOW = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
+# Shared by log_command and log_commands so both hit the same cached prepared statement
+_SQL_INSERT_COMMAND = "INSERT INTO command_log (user_id, message, intent, response) VALUES (?, ?, ?, ?)"
+
+# Last wizard-state JSON written per user (oldest evicted first), so re-saving an unchanged
+# state skips the encrypt + write
+_WIZARD_CACHE_MAX = 512
+_last_wizard_state = OrderedDict()
+
+
+# Read-side row types: positional construction, attribute access, no per-row dict
+Job = namedtuple('Job', 'id name kit mode status created_at completed_at summary')
+Command = namedtuple('Command', 'id user_id message intent response timestamp')
+
+
+def _fetch_tuples(sql: str, params=()) -> list:
+    """Run a SELECT and return plain tuples (bypasses sqlite3.Row for bulk reads)."""
+    with _conn_lock:
+        cur = get_connection().cursor()
+        cur.row_factory = None
+        return cur.execute(sql, params).fetchall()
+
+
 def _ensure_dir():
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
 
+# One connection for the process (bot loop + to_thread workers); its page cache stays warm
+# between calls. _conn_lock serialises every use, since sqlite3 connections aren't thread-safe.
+# Autocommit (isolation_level=None): a single statement is its own transaction, with no
+# implicit BEGIN/COMMIT round-trips; multi-row writes group themselves with _transaction().
+_conn = None
+_conn_lock = threading.RLock()
+
+
 def get_connection():
-    _ensure_dir()
-    db_exists = os.path.exists(DB_PATH)
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    # SECURITY §4.5: Restrict DB file permissions to owner-only
-    if not db_exists:
-        os.chmod(DB_PATH, 0o600)
-    return conn
+    """Return the shared connection, opening it and applying the pragmas on first use."""
+    global _conn
+    if _conn is not None:
+        return _conn  # Fast path: no lock, no stat; setup below runs once per process
+    with _conn_lock:
+        if _conn is None:
+            _ensure_dir()
+            db_exists = os.path.exists(DB_PATH)
+            conn = sqlite3.connect(
+                DB_PATH, check_same_thread=False, cached_statements=256, isolation_level=None
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")  # Persistent: readers no longer block the log writer
+            # WAL makes NORMAL durable enough and keeps commits cheap
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-64000")  # 64 MB ceiling, allocated as pages are used
+            conn.execute("PRAGMA busy_timeout=10000")  # Wait out other processes (install scripts) instead of failing
+            # SECURITY §4.5: Restrict DB file permissions to owner-only
+            if not db_exists:
+                os.chmod(DB_PATH, 0o600)
+            _conn = conn
+        return _conn
+
+
+@contextmanager
+def _transaction(conn):
+    """One write transaction (BEGIN IMMEDIATE takes the write lock up front); rolled back on error."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
 
 
 def init_db():
     """Create tables if they don't exist."""
-    conn = get_connection()
-    conn.executescript("""
-        CREATE TABLE IF NOT EXISTS jobs (
-            id          TEXT PRIMARY KEY,
-            name        TEXT,
-            kit         TEXT,
-            mode        TEXT,
-            status      TEXT DEFAULT 'PENDING',
-            created_at  DATETIME,
-            completed_at DATETIME,
-            summary     TEXT
-        );
-
-        CREATE TABLE IF NOT EXISTS command_log (
-            id          INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id     INTEGER,
-            message     TEXT,
-            intent      TEXT,
-            response    TEXT,
-            timestamp   DATETIME DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE TABLE IF NOT EXISTS user_wizard_state (
-            user_id     INTEGER PRIMARY KEY,
-            state       TEXT
-        );
-
-        CREATE TABLE IF NOT EXISTS user_autonomy_state (
-            user_id     INTEGER PRIMARY KEY,
-            mode        TEXT DEFAULT 'security'
-        );
-    """)
-    conn.commit()
-    conn.close()
+    with _conn_lock:
+        conn = get_connection()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id          TEXT PRIMARY KEY,
+                name        TEXT,
+                kit         TEXT,
+                mode        TEXT,
+                status      TEXT DEFAULT 'PENDING',
+                created_at  DATETIME,
+                completed_at DATETIME,
+                summary     TEXT
+            );
+
+            CREATE TABLE IF NOT EXISTS command_log (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id     INTEGER,
+                message     TEXT,
+                intent      TEXT,
+                response    TEXT,
+                timestamp   DATETIME DEFAULT CURRENT_TIMESTAMP
+            );
+
+            CREATE TABLE IF NOT EXISTS user_wizard_state (
+                user_id     INTEGER PRIMARY KEY,
+                state       TEXT
+            );
+
+            CREATE TABLE IF NOT EXISTS user_autonomy_state (
+                user_id     INTEGER PRIMARY KEY,
+                mode        TEXT DEFAULT 'security'
+            );
+
+            -- get_all_jobs / get_recent_commands read newest-first: walk an index, no sort
+            CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at DESC);
+            CREATE INDEX IF NOT EXISTS idx_cmdlog_ts ON command_log(timestamp DESC);
+        """)
+        _migrate_autonomy_plaintext(conn)
+
+
+def _migrate_autonomy_plaintext(conn):
+    """Autonomy modes used to be encrypted; rewrite any such rows as plaintext (one-time, idempotent)."""
+    if not _fernet:
+        return
+    rows = conn.execute("SELECT user_id, mode FROM user_autonomy_state").fetchall()
+    updates = []
+    for r in rows:
+        mode = decrypt_val(r['mode'])
+        if mode != r['mode']:
+            updates.append((mode, r['user_id']))
+    if updates:
+        with _transaction(conn):
+            conn.executemany("UPDATE user_autonomy_state SET mode = ? WHERE user_id = ?", updates)
+        logger.info(f"Migrated {len(updates)} autonomy mode rows to plaintext")
 
 
 def log_command(user_id: int, message: str, intent: str, response: str):
-    conn = get_connection()
-    conn.execute(
-        "INSERT INTO command_log (user_id, message, intent, response) VALUES (?, ?, ?, ?)",
-        (user_id, encrypt_val(message), encrypt_val(intent), encrypt_val(response))
-    )
-    conn.commit()
-    conn.close()
+    row = (user_id, encrypt_val(message), encrypt_val(intent), encrypt_val(response))
+    with _conn_lock:
+        conn = get_connection()
+        conn.execute(_SQL_INSERT_COMMAND, row)
+
+
+def log_commands(rows):
+    """Insert many (user_id, message, intent, response) rows in one transaction."""
+    if _fernet:
+        enc = encrypt_val
+        encrypted = [(user_id, enc(message), enc(intent), enc(response))
+                     for user_id, message, intent, response in rows]
+    else:
+        encrypted = rows  # Plaintext mode: bind the rows as they are
+    with _conn_lock:
+        conn = get_connection()
+        with _transaction(conn):
+            conn.executemany(_SQL_INSERT_COMMAND, encrypted)
 
 
 def create_job(job_id: str, name: str, kit: str, mode: str):
-    conn = get_connection()
-    conn.execute(
-        "INSERT INTO jobs (id, name, kit, mode, status, created_at) VALUES (?, ?, ?, ?, 'PENDING', ?)",
-        (job_id, encrypt_val(name), kit, mode, datetime.now().isoformat())
-    )
-    conn.commit()
-    conn.close()
-
-
-def update_job_status(job_id: str, status: str, summary: str = None):
-    conn = get_connection()
-    if status == "COMPLETE":
+    with _conn_lock:
+        conn = get_connection()
         conn.execute(
-            "UPDATE jobs SET status = ?, summary = ?, completed_at = ? WHERE id = ?",
-            (status, encrypt_val(summary), datetime.now().isoformat(), job_id)
+            "INSERT INTO jobs (id, name, kit, mode, status, created_at) "
+            f"VALUES (?, ?, ?, ?, 'PENDING', {_SQL_NOW})",
+            (job_id, encrypt_val(name), kit, mode)
         )
-    else:
-        conn.execute("UPDATE jobs SET status = ? WHERE id = ?", (status, job_id))
-    conn.commit()
-    conn.close()
 
 
-def get_all_jobs():
-    conn = get_connection()
-    rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC").fetchall()
-    conn.close()
-    
-    decrypted = []
-    for r in rows:
-        d = dict(r)
-        d['name'] = decrypt_val(d.get('name', '')) if d.get('name') else d.get('name')
-        d['summary'] = decrypt_val(d.get('summary', '')) if d.get('summary') else d.get('summary')
-        decrypted.append(d)
-    return decrypted
-
-
-def get_recent_commands(limit=10):
-    conn = get_connection()
-    rows = conn.execute("SELECT * FROM command_log ORDER BY timestamp DESC LIMIT ?", (limit,)).fetchall()
-    conn.close()
-    
-    decrypted = []
-    for r in rows:
-        d = dict(r)
-        d['message'] = decrypt_val(d.get('message', '')) if d.get('message') else d.get('message')
-        d['intent'] = decrypt_val(d.get('intent', '')) if d.get('intent') else d.get('intent')
-        d['response'] = decrypt_val(d.get('response', '')) if d.get('response') else d.get('response')
-        decrypted.append(d)
-    return decrypted
+def update_job_status(job_id: str, status: str, summary: str = None):
+    with _conn_lock:
+        conn = get_connection()
+        if status == "COMPLETE":
+            conn.execute(
+                f"UPDATE jobs SET status = ?, summary = ?, completed_at = {_SQL_NOW} WHERE id = ?",
+                (status, encrypt_val(summary), job_id)
+            )
+        else:
+            conn.execute("UPDATE jobs SET status = ? WHERE id = ?", (status, job_id))
+
+
+def get_all_jobs(limit: int = -1) -> list:
+    """Jobs newest first, as Job tuples (limit < 0: all of them)."""
+    rows = _fetch_tuples(
+        "SELECT id, name, kit, mode, status, created_at, completed_at, summary "
+        "FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+    )
+    if not _fernet:
+        return list(map(Job._make, rows))  # Plaintext mode: nothing to decrypt
+    dec = decrypt_val
+    return [Job(i, dec(name), kit, mode, status, created, completed, dec(summary))
+            for i, name, kit, mode, status, created, completed, summary in rows]
+
+
+def get_recent_commands(limit=10) -> list:
+    """Latest command_log rows, newest first, as Command tuples."""
+    rows = _fetch_tuples(
+        "SELECT id, user_id, message, intent, response, timestamp "
+        "FROM command_log ORDER BY timestamp DESC LIMIT ?", (limit,)
+    )
+    if not _fernet:
+        return list(map(Command._make, rows))  # Plaintext mode: nothing to decrypt
+    dec = decrypt_val
+    return [Command(i, user_id, dec(message), dec(intent), dec(response), ts)
+            for i, user_id, message, intent, response, ts in rows]
 
 
 def get_wizard_state(user_id: int) -> dict:
-    import json
-    conn = get_connection()
-    row = conn.execute("SELECT state FROM user_wizard_state WHERE user_id = ?", (user_id,)).fetchone()
-    conn.close()
+    with _conn_lock:
+        row = get_connection().execute(
+            "SELECT state FROM user_wizard_state WHERE user_id = ?", (user_id,)
+        ).fetchone()
     if row and row['state']:
         try:
             return json.loads(decrypt_val(row['state']))
@@ -164,39 +266,43 @@ def get_wizard_state(user_id: int) -> dict:
 
 
 def set_wizard_state(user_id: int, state: dict):
-    import json
-    conn = get_connection()
-    enc_state = encrypt_val(json.dumps(state))
-    conn.execute(
-        "INSERT INTO user_wizard_state (user_id, state) VALUES (?, ?) ON CONFLICT(user_id) DO UPDATE SET state=excluded.state",
-        (user_id, enc_state)
-    )
-    conn.commit()
-    conn.close()
+    payload = json.dumps(state, separators=(',', ':'))
+    if _last_wizard_state.get(user_id) == payload:
+        return
+    enc_state = encrypt_val(payload)
+    with _conn_lock:
+        conn = get_connection()
+        conn.execute(
+            "INSERT INTO user_wizard_state (user_id, state) VALUES (?, ?) ON CONFLICT(user_id) DO UPDATE SET state=excluded.state",
+            (user_id, enc_state)
+        )
+        _last_wizard_state[user_id] = payload
+        _last_wizard_state.move_to_end(user_id)
+        if len(_last_wizard_state) > _WIZARD_CACHE_MAX:
+            _last_wizard_state.popitem(last=False)
 
 
 def clear_wizard_state(user_id: int):
-    conn = get_connection()
-    conn.execute("DELETE FROM user_wizard_state WHERE user_id = ?", (user_id,))
-    conn.commit()
-    conn.close()
+    with _conn_lock:
+        conn = get_connection()
+        conn.execute("DELETE FROM user_wizard_state WHERE user_id = ?", (user_id,))
+        _last_wizard_state.pop(user_id, None)
 
 
 def get_autonomy_mode(user_id: int) -> str:
-    conn = get_connection()
-    row = conn.execute("SELECT mode FROM user_autonomy_state WHERE user_id = ?", (user_id,)).fetchone()
-    conn.close()
+    with _conn_lock:
+        row = get_connection().execute(
+            "SELECT mode FROM user_autonomy_state WHERE user_id = ?", (user_id,)
+        ).fetchone()
     if row and row['mode']:
-        return decrypt_val(row['mode'])
+        return row['mode']  # Plaintext: a small enumerated set, nothing to protect
     return "security"  # Default mode
 
 
 def set_autonomy_mode(user_id: int, mode: str):
-    conn = get_connection()
-    enc_mode = encrypt_val(mode)
-    conn.execute(
-        "INSERT INTO user_autonomy_state (user_id, mode) VALUES (?, ?) ON CONFLICT(user_id) DO UPDATE SET mode=excluded.mode",
-        (user_id, enc_mode)
-    )
-    conn.commit()
-    conn.close()
+    with _conn_lock:
+        conn = get_connection()
+        conn.execute(
+            "INSERT INTO user_autonomy_state (user_id, mode) VALUES (?, ?) ON CONFLICT(user_id) DO UPDATE SET mode=excluded.mode",
+            (user_id, mode)
+        )
@@ -123,16 +123,16 @@ def update_instructor(constitution_path: Path) -> bool:
 
     print("\n🔧 Updating INSTRUCTOR.xml...")
 
-    with open(instructor_path, 'r') as f:
+    with open(instructor_path, 'r+') as f:
         content = f.read()
 
-    # Check if already updated
-    if "AI_PROTOCOL.xml" in content or "ai_inbox" in content:
-        print("   ✓ Already has AI protocol hooks")
-        return True
+        # Check if already updated
+        if "AI_PROTOCOL.xml" in content or "ai_inbox" in content:
+            print("   ✓ Already has AI protocol hooks")
+            return True
 
-    # Find a good insertion point (before closing tag or at end)
-    hook_xml = """
+        # Find a good insertion point (before closing tag or at end)
+        hook_xml = """
   <!-- ═══════════════════════════════════════════════════════════════ -->
   <!--                     OMEGA CLAW INTEGRATION                       -->
   <!-- ═══════════════════════════════════════════════════════════════ -->
@@ -167,17 +167,19 @@ def update_instructor(constitution_path: Path) -> bool:
 
 """
 
-    # Insert before closing </instructor> tag
-    if "</instructor>" in content:
-        content = content.replace("</instructor>", hook_xml + "</instructor>")
-    elif "</constitution>" in content:
-        content = content.replace("</constitution>", hook_xml + "</constitution>")
-    else:
-        # Just append
-        content += hook_xml
-
-    with open(instructor_path, 'w') as f:
+        # Insert before closing </instructor> tag
+        if "</instructor>" in content:
+            content = content.replace("</instructor>", hook_xml + "</instructor>")
+        elif "</constitution>" in content:
+            content = content.replace("</constitution>", hook_xml + "</constitution>")
+        else:
+            # Just append
+            content += hook_xml
+
+        # Rewrite in place on the same descriptor
+        f.seek(0)
         f.write(content)
+        f.truncate()
 
     print("   ✓ Added Omega Claw hook to INSTRUCTOR.xml")
     return True
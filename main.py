@@ -5,7 +5,6 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from core.logging_setup import setup_logging
-from db.database import init_db
 
 def main():
     setup_logging()
@@ -27,7 +26,8 @@ def main():
         logging.critical("=" * 60)
         exit(1)
     
-    # Initialize SQLite
+    # Initialize SQLite (imported only now: the crypto + sqlite chain is wasted on a bad token)
+    from db.database import init_db
     init_db()
     logging.info("🦀 Omega Claw: Database initialized.")
     